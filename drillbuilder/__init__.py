@@ -1,7 +1,76 @@
+import atexit
+import logging
 import os
+import queue
+import sys
+from logging.handlers import QueueHandler, QueueListener
+import click
 from flask import Flask
+from flask.cli import with_appcontext
+from flask.logging import default_handler
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
 from .config import Config
-from .extensions import db, migrate, jwt
+from .extensions import db, jwt
+
+# Rows per INSERT when loading reference data from JSON
+LOAD_BATCH_SIZE = 10_000
+
+# App shared by test fixtures, built on first use (see get_or_create_testing_app)
+_cached_app = None
+
+# Request threads only enqueue log records; one background thread writes them
+_log_queue = queue.SimpleQueue()
+_log_listener = None
+
+
+def _configure_logging(app):
+    """Route app.logger through a queue so handlers never block a request on I/O."""
+    global _log_listener
+    if _log_listener is None:
+        handler = logging.StreamHandler(sys.stderr)
+        handler.setFormatter(default_handler.formatter)
+        _log_listener = QueueListener(_log_queue, handler)
+        _log_listener.start()
+        atexit.register(_log_listener.stop)
+
+    # every app built from this package shares the "drillbuilder" logger
+    app.logger.removeHandler(default_handler)
+    if not any(isinstance(h, QueueHandler) for h in app.logger.handlers):
+        app.logger.addHandler(QueueHandler(_log_queue))
+    app.logger.setLevel(app.config["LOG_LEVEL"] or ("DEBUG" if app.debug else "WARNING"))
+
+
+def _apply_pool_defaults(app):
+    """Size the connection pool for server databases; SQLite keeps Flask-SQLAlchemy's defaults."""
+    if make_url(app.config["SQLALCHEMY_DATABASE_URI"]).get_backend_name() == "sqlite":
+        return
+    options = app.config.setdefault("SQLALCHEMY_ENGINE_OPTIONS", {})
+    options.setdefault("pool_size", app.config["DB_POOL_SIZE"])
+    options.setdefault("max_overflow", app.config["DB_MAX_OVERFLOW"])
+    # drop connections the server or a proxy closed while they sat idle in the pool
+    options.setdefault("pool_pre_ping", True)
+    options.setdefault("pool_recycle", 3600)
+
+
+def _configure_sqlite(app):
+    """Set per-connection pragmas on a SQLite engine: FK enforcement, WAL journal, in-memory temp tables."""
+    with app.app_context():
+        engine = db.engine
+    if engine.dialect.name != "sqlite":
+        return
+    # WAL makes NORMAL safe against corruption; tests throw the data away, so skip fsync entirely
+    synchronous = "OFF" if app.config.get("TESTING") else "NORMAL"
+
+    @event.listens_for(engine, "connect")
+    def _set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        # off by default in SQLite; the quiz tree relies on ON DELETE CASCADE
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.execute("PRAGMA journal_mode=WAL")  # in-memory databases stay in "memory" mode
+        cursor.execute(f"PRAGMA synchronous={synchronous}")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.close()
 
 
 def create_app(test_config=None):
@@ -11,51 +80,117 @@ def create_app(test_config=None):
     if test_config is not None:
         app.config.update(test_config)
 
-    # init extensions
+    _configure_logging(app)
+
+    # init extensions; migrations are only needed by `flask db`, JWT only when serving requests
+    mode = app.config.get("DRILLBUILDER_MODE")
+    _apply_pool_defaults(app)
     db.init_app(app)
-    migrate.init_app(app, db)
-    jwt.init_app(app)
+    _configure_sqlite(app)
+    if mode != "web":
+        from flask_migrate import Migrate
 
-    # register blueprints
-    from .routes import register_blueprints
+        Migrate(app, db)
+    if mode != "cli":
+        jwt.init_app(app)
 
-    register_blueprints(app)
+    # register blueprints (test fixtures that only need the ORM can skip them)
+    if not app.config.get("SKIP_BLUEPRINTS"):
+        from .routes import register_blueprints
 
-    # CLI commands
-    @app.cli.command()
-    def init_db():
-        """Initialize the database tables and load languages."""
-        import json
-        from pathlib import Path
-        
-        try:
-            db.create_all()
-            print("✓ Database tables created successfully")
-            
-            # Import languages from JSON
-            from .models import Language
-            
-            # Check if languages already loaded
-            if Language.query.first() is None:
-                lang_file = Path(__file__).parent.parent / 'import' / 'languages.json'
-                if lang_file.exists():
-                    with open(lang_file, 'r', encoding='utf-8') as f:
-                        languages = json.load(f)
-                    
-                    for lang in languages:
-                        language = Language(code=lang['alpha2'], name=lang['English'])
-                        db.session.add(language)
-                    
-                    db.session.commit()
-                    print(f"✓ Loaded {len(languages)} languages")
-                else:
-                    print("⚠ Warning: languages.json not found")
-            else:
-                print("✓ Languages already loaded")
-        except Exception as e:
-            db.session.rollback()
-            print(f"✗ Error during initialization: {e}")
-            raise
+        register_blueprints(app)
+
+    # CLI commands; their heavy imports happen only when the command runs
+    app.cli.add_command(init_db_command)
 
     return app
 
+
+def get_or_create_testing_app(test_config):
+    """
+    Return a process-wide app for tests, creating it on the first call.
+
+    Building the app (extensions, blueprints) once per test session instead of
+    once per test keeps fixtures cheap. Only the first call's test_config is
+    used; fixtures are expected to reset database state between tests.
+    """
+    global _cached_app
+    if _cached_app is None:
+        _cached_app = create_app(test_config)
+    return _cached_app
+
+
+def _copy_load(table, columns, rows):
+    """
+    Stream rows into a PostgreSQL table with COPY ... FROM STDIN.
+
+    Runs on the session's connection so the load commits or rolls back
+    together with the rest of the session.
+    """
+    import csv
+    import io
+
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    count = 0
+    for row in rows:
+        writer.writerow(row)
+        count += 1
+    buf.seek(0)
+
+    dbapi_conn = db.session.connection().connection
+    with dbapi_conn.cursor() as cursor:
+        cursor.copy_expert(f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", buf)
+    return count
+
+
+def _bulk_load(model, rows):
+    """Insert a batch of row dicts for `model`, using COPY when the database is PostgreSQL."""
+    if db.engine.dialect.name == 'postgresql':
+        columns = list(rows[0])
+        return _copy_load(model.__tablename__, columns, ([row[c] for c in columns] for row in rows))
+    db.session.bulk_insert_mappings(model, rows)
+    return len(rows)
+
+
+@click.command("init-db")
+@with_appcontext
+def init_db_command():
+    """Initialize the database tables and load languages."""
+    import ijson
+    from pathlib import Path
+    
+    try:
+        db.create_all()
+        print("✓ Database tables created successfully")
+        
+        # Import languages from JSON
+        from .models import Language
+        
+        # Check if languages already loaded
+        if Language.query.first() is None:
+            lang_file = Path(__file__).parent.parent / 'import' / 'languages.json'
+            if lang_file.exists():
+                # Stream the file so memory stays flat however large it grows,
+                # flushing rows in batches (COPY on PostgreSQL, multi-row INSERT elsewhere)
+                loaded = 0
+                batch = []
+                with open(lang_file, 'rb') as f:
+                    for lang in ijson.items(f, 'item'):
+                        batch.append({'code': lang['alpha2'], 'name': lang['English']})
+                        if len(batch) >= LOAD_BATCH_SIZE:
+                            loaded += _bulk_load(Language, batch)
+                            batch = []
+                if batch:
+                    loaded += _bulk_load(Language, batch)
+                
+                db.session.commit()
+                print(f"✓ Loaded {loaded} languages")
+            else:
+                print("⚠ Warning: languages.json not found")
+        else:
+            print("✓ Languages already loaded")
+    except Exception as e:
+        db.session.rollback()
+        print(f"✗ Error during initialization: {e}")
+        raise
@@ -0,0 +1,112 @@
+"""
+Optional Redis-backed caching for read-mostly payloads.
+
+Caching is enabled by setting REDIS_URL. Without it, or if Redis is
+unreachable, every helper behaves like a cache miss and callers fall through
+to the database. Connects and commands time out after REDIS_CONNECT_TIMEOUT
+and REDIS_SOCKET_TIMEOUT seconds, so a host that drops packets costs each
+request at most that long.
+
+There is no stale fallback copy for when the database is down: the requests
+that read these entries write to the database too, so they fail regardless.
+"""
+
+import redis
+from flask import current_app
+
+QUIZ_QUESTIONS_TTL = 60  # seconds
+LOGIN_TTL = 300  # seconds
+
+_client = None
+
+
+def get_redis():
+    """Return the shared Redis client, or None when REDIS_URL is not configured."""
+    global _client
+    url = current_app.config.get("REDIS_URL")
+    if not url:
+        return None
+    if _client is None:
+        # redis-py keeps a connection pool per client, so one client serves all requests
+        _client = redis.Redis.from_url(
+            url,
+            socket_connect_timeout=current_app.config["REDIS_CONNECT_TIMEOUT"],
+            socket_timeout=current_app.config["REDIS_SOCKET_TIMEOUT"],
+        )
+    return _client
+
+
+def quiz_questions_key(quiz_id):
+    return f"quiz:{quiz_id}:questions:v1"
+
+
+def get_quiz_questions(quiz_id):
+    """Return the cached, JSON-encoded question list for a quiz, or None."""
+    client = get_redis()
+    if client is None:
+        return None
+    try:
+        return client.get(quiz_questions_key(quiz_id))
+    except redis.RedisError:
+        current_app.logger.warning("redis unavailable, reading quiz %s questions from db", quiz_id)
+        return None
+
+
+def set_quiz_questions(quiz_id, payload):
+    """Cache the JSON-encoded question list for a quiz."""
+    client = get_redis()
+    if client is None:
+        return
+    try:
+        client.set(quiz_questions_key(quiz_id), payload, ex=QUIZ_QUESTIONS_TTL)
+    except redis.RedisError:
+        current_app.logger.warning("redis unavailable, quiz %s questions not cached", quiz_id)
+
+
+def invalidate_quiz_questions(quiz_id):
+    """Drop the cached question list; call whenever a quiz's questions change."""
+    client = get_redis()
+    if client is None:
+        return
+    try:
+        client.delete(quiz_questions_key(quiz_id))
+    except redis.RedisError:
+        current_app.logger.warning("redis unavailable, quiz %s questions not invalidated", quiz_id)
+
+
+def login_key(identifier):
+    return f"login:{identifier.lower()}:v1"
+
+
+def get_login_user(identifier):
+    """Return the cached, JSON-encoded login record for a username/email, or None."""
+    client = get_redis()
+    if client is None:
+        return None
+    try:
+        return client.get(login_key(identifier))
+    except redis.RedisError:
+        current_app.logger.warning("redis unavailable, looking up login from db")
+        return None
+
+
+def set_login_user(identifier, payload):
+    """Cache the JSON-encoded login record (id, username, password hash) for a username/email."""
+    client = get_redis()
+    if client is None:
+        return
+    try:
+        client.set(login_key(identifier), payload, ex=LOGIN_TTL)
+    except redis.RedisError:
+        current_app.logger.warning("redis unavailable, login not cached")
+
+
+def invalidate_login_user(username, email):
+    """Drop cached login records; call whenever a user's password hash changes."""
+    client = get_redis()
+    if client is None:
+        return
+    try:
+        client.delete(login_key(username), login_key(email))
+    except redis.RedisError:
+        current_app.logger.warning("redis unavailable, login cache for %s not invalidated", username)
@@ -7,5 +7,34 @@ class Config:
     SQLALCHEMY_DATABASE_URI = os.environ.get("DATABASE_URL", "sqlite:///drillbuilder.db")
     SQLALCHEMY_TRACK_MODIFICATIONS = False
 
+    # Per-worker connection pool for PostgreSQL/MySQL; ignored for SQLite
+    DB_POOL_SIZE = int(os.environ.get("DB_POOL_SIZE", "5"))
+    DB_MAX_OVERFLOW = int(os.environ.get("DB_MAX_OVERFLOW", "10"))
+
     JWT_SECRET_KEY = os.environ.get("JWT_SECRET_KEY", "jwt-secret")
     JWT_ACCESS_TOKEN_EXPIRES = timedelta(days=7)
+
+    # argon2id cost for password hashes; existing hashes are upgraded on login
+    # when these change. Tests lower them to the minimum.
+    ARGON2_TIME_COST = int(os.environ.get("ARGON2_TIME_COST", "2"))
+    ARGON2_MEMORY_COST = int(os.environ.get("ARGON2_MEMORY_COST", "65536"))  # KiB
+
+    # Unset means DEBUG when the app runs in debug mode and WARNING otherwise,
+    # so per-request debug/info lines cost only a level check in production
+    LOG_LEVEL = os.environ.get("LOG_LEVEL")
+
+    # Optional; enables caching of read-mostly payloads (see drillbuilder/cache.py)
+    REDIS_URL = os.environ.get("REDIS_URL")
+    # Seconds to wait on Redis before treating it as a cache miss; keep these
+    # short so an unreachable host doesn't stall every request
+    REDIS_CONNECT_TIMEOUT = float(os.environ.get("REDIS_CONNECT_TIMEOUT", "0.1"))
+    REDIS_SOCKET_TIMEOUT = float(os.environ.get("REDIS_SOCKET_TIMEOUT", "0.1"))
+
+    # "web" for request-serving workers (skips Flask-Migrate/Alembic setup),
+    # "cli" for management commands (skips JWT setup); unset initialises both
+    DRILLBUILDER_MODE = os.environ.get("DRILLBUILDER_MODE", "")
+
+    # Internal nginx location that aliases the uploads directory; when set,
+    # image GETs are handed to nginx via X-Accel-Redirect instead of being
+    # streamed through the worker (see DEPLOYMENT.md)
+    IMAGES_ACCEL_REDIRECT = os.environ.get("IMAGES_ACCEL_REDIRECT")
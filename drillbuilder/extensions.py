@@ -1,7 +1,10 @@
 from flask_sqlalchemy import SQLAlchemy
-from flask_migrate import Migrate
 from flask_jwt_extended import JWTManager
 
-db = SQLAlchemy()
-migrate = Migrate()
+# Objects stay readable after commit without a refresh SELECT per instance.
+# Each request gets its own session, so nothing outlives the request that loaded it.
+db = SQLAlchemy(session_options={"expire_on_commit": False})
 jwt = JWTManager()
+
+# Flask-Migrate is set up in create_app only when migrations may run, since
+# importing it pulls in Alembic
@@ -8,9 +8,40 @@ This design allows:
 4. Consistent validation and grading logic
 """
 
+import json
+import string
+import unicodedata
 from datetime import datetime
+from rapidfuzz.distance import Levenshtein
 from .extensions import db
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.ext.declarative import declared_attr
+from sqlalchemy.orm import deferred, raiseload, reconstructor, selectinload, with_polymorphic
+
+# Characters stripped from both ends of cloze answers before comparison. ASCII
+# answers use a plain str.strip; anything else goes through _strip_unicode_punct,
+# which also trims Unicode punctuation such as "¿" and "¡"
+_PUNCT_STRIP = string.punctuation + string.whitespace
+
+
+def _is_punct_or_space(ch):
+    """True for Unicode punctuation (P*), separators (Z*) and whitespace controls."""
+    return unicodedata.category(ch)[0] in 'PZ' or ch.isspace()
+
+
+def _strip_unicode_punct(text):
+    """
+    Strip punctuation and whitespace from both ends of a non-ASCII string.
+
+    Combining marks (M*) are kept: Thai and Devanagari vowel and tone signs
+    are part of the word, not trailing punctuation.
+    """
+    start, end = 0, len(text)
+    while start < end and _is_punct_or_space(text[start]):
+        start += 1
+    while end > start and _is_punct_or_space(text[end - 1]):
+        end -= 1
+    return text[start:end]
 
 
 # ============================================================================
@@ -25,28 +56,50 @@ class QuestionBase(db.Model):
     __tablename__ = "questions"
     
     id = db.Column(db.Integer, primary_key=True)
-    quiz_id = db.Column(db.Integer, db.ForeignKey("quizzes.id"), nullable=False)
+    quiz_id = db.Column(db.Integer, db.ForeignKey("quizzes.id", ondelete="CASCADE"), nullable=False)
     type = db.Column(db.String(32), nullable=False)  # Discriminator column
-    prompt_text = db.Column(db.Text, nullable=False)
+    prompt_text = deferred(db.Column(db.Text, nullable=False), group='body')
     prompt_image_url = db.Column(db.String(500), nullable=True)  # New: image support
-    answer_explanation = db.Column(db.Text, nullable=True)
+    answer_explanation = deferred(db.Column(db.Text, nullable=True), group='body')
     position = db.Column(db.Integer, default=0)  # For ordering questions
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
+    __table_args__ = (db.Index('ix_questions_quiz_position', 'quiz_id', 'position'),)
+    
     # Polymorphic configuration
     __mapper_args__ = {
         'polymorphic_identity': 'base',
         'polymorphic_on': type,
-        'with_polymorphic': '*'
     }
     
     # Relationships
     quiz = db.relationship("Quiz", back_populates="questions")
+    # Loaded on demand; grading/serialization paths opt in to selectinload.
+    # Ordered in SQL (backed by ix_ac_question_position) so callers get components by position
     answer_components = db.relationship("AnswerComponentBase", back_populates="question", 
-                                       cascade="all, delete-orphan", lazy="selectin")
+                                       cascade="all, delete-orphan", lazy="select",
+                                       order_by="AnswerComponentBase.position")
     user_answers = db.relationship("UserAnswer", back_populates="question", 
                                    cascade="all, delete-orphan")
     
+    @classmethod
+    def load_for_grading(cls, question_id):
+        """Load a single question with its subclass columns and answer components."""
+        question = with_polymorphic(cls, '*')
+        components = with_polymorphic(AnswerComponentBase, '*')
+        return db.session.query(question).options(
+            selectinload(question.answer_components.of_type(components)).undefer_group('body')
+        ).filter(question.id == question_id).first()
+    
+    @classmethod
+    def load_many_for_grading(cls, question_ids, quiz_id):
+        """Load several questions of one quiz, with answer components, in two queries."""
+        question = with_polymorphic(cls, '*')
+        components = with_polymorphic(AnswerComponentBase, '*')
+        return db.session.query(question).options(
+            selectinload(question.answer_components.of_type(components)).undefer_group('body')
+        ).filter(question.id.in_(question_ids), question.quiz_id == quiz_id).all()
+    
     def validate_answer(self, user_response):
         """
         Override in subclasses to implement question-specific validation logic.
@@ -55,7 +108,8 @@ class QuestionBase(db.Model):
             user_response: The user's response (format varies by question type)
             
         Returns:
-            tuple: (is_correct: bool, feedback: str or None)
+            tuple: (is_correct: bool, feedback: str or None, details: dict or None)
+            details carries per-part results for types that have them (cloze blanks)
         """
         raise NotImplementedError("Subclasses must implement validate_answer()")
     
@@ -85,17 +139,18 @@ class AnswerComponentBase(db.Model):
     __tablename__ = "answer_components"
     
     id = db.Column(db.Integer, primary_key=True)
-    question_id = db.Column(db.Integer, db.ForeignKey("questions.id"), nullable=False)
+    question_id = db.Column(db.Integer, db.ForeignKey("questions.id", ondelete="CASCADE"), nullable=False)
     component_type = db.Column(db.String(32), nullable=False)  # Discriminator
     position = db.Column(db.Integer, default=0)  # For ordering
     image_url = db.Column(db.String(500), nullable=True)  # New: image support
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
+    __table_args__ = (db.Index('ix_ac_question_position', 'question_id', 'position'),)
+    
     # Polymorphic configuration
     __mapper_args__ = {
         'polymorphic_identity': 'base',
         'polymorphic_on': component_type,
-        'with_polymorphic': '*'
     }
     
     # Relationships
@@ -125,6 +180,15 @@ class MultipleChoiceQuestion(QuestionBase):
     allow_multiple = db.Column(db.Boolean, default=False, nullable=True)  # Allow multiple correct selections
     randomize_order = db.Column(db.Boolean, default=True, nullable=True)
     
+    # Set of correct option ids (and its size), computed on first grading after load
+    _correct_ids = None
+    _num_correct = 0
+    
+    @reconstructor
+    def _init_on_load(self):
+        self._correct_ids = None
+        self._num_correct = 0
+    
     def validate_answer(self, user_response):
         """
         Validate MCQ answer.
@@ -133,28 +197,33 @@ class MultipleChoiceQuestion(QuestionBase):
             user_response: list of selected option IDs
             
         Returns:
-            tuple: (is_correct, feedback)
+            tuple: (is_correct, feedback, None)
         """
-        if not isinstance(user_response, list):
-            user_response = [user_response]
+        if self._correct_ids is None:
+            self._correct_ids = frozenset(c.id for c in self.answer_components if c.is_correct)
+            self._num_correct = len(self._correct_ids)
         
-        user_response = set(user_response)
-        correct_ids = set(c.id for c in self.answer_components if c.is_correct)
+        if isinstance(user_response, list):
+            user_response = frozenset(user_response)
+        else:
+            user_response = frozenset([user_response])
+        num_selected = len(user_response)
         
-        is_correct = user_response == correct_ids
+        # Cheap length check first; only same-sized selections need the subset test
+        is_correct = num_selected == self._num_correct and user_response <= self._correct_ids
         
         if is_correct:
             feedback = "Correct!"
         else:
-            feedback = f"Incorrect. You selected {len(user_response)} option(s), but {len(correct_ids)} are correct."
+            feedback = f"Incorrect. You selected {num_selected} option(s), but {self._num_correct} are correct."
         
-        return is_correct, feedback
+        return is_correct, feedback, None
     
     def to_dict(self):
         data = super().to_dict()
         data['allow_multiple'] = self.allow_multiple
         data['randomize_order'] = self.randomize_order
-        data['options'] = [c.to_dict() for c in sorted(self.answer_components, key=lambda x: x.position)]
+        data['options'] = [c.to_dict() for c in self.answer_components]
         return data
 
 
@@ -186,7 +255,7 @@ class ClozeQuestion(QuestionBase):
         'polymorphic_identity': 'cloze',
     }
     
-    full_text = db.Column(db.Text, nullable=True)
+    full_text = deferred(db.Column(db.Text, nullable=True), group='body')
     show_word_bank = db.Column(db.Boolean, default=False, nullable=True)
     case_sensitive = db.Column(db.Boolean, default=False, nullable=True)
         
@@ -201,7 +270,8 @@ class ClozeQuestion(QuestionBase):
             tuple: (is_correct, feedback, details)
             details is a dict mapping blank index to validation result
         """
-        blanks = sorted(self.answer_components, key=lambda x: x.position)
+        user_response = user_response or {}  # unanswered: every blank is empty
+        blanks = self.answer_components  # already ordered by position
         total_blanks = len(blanks)
         correct_count = 0
         typo_count = 0
@@ -211,13 +281,10 @@ class ClozeQuestion(QuestionBase):
             user_answer = user_response.get(str(idx), '').strip()
             result = blank.validate_answer(user_answer, self.case_sensitive)
             
-            # Get the correct answer - support both old and new schema
-            correct_ans = blank.correct_answer or getattr(blank, 'word', None)
-            
             details[str(idx)] = {
                 'result': result,
                 'user_answer': user_answer,
-                'correct_answer': correct_ans
+                'correct_answer': blank.correct_answer
             }
             
             if result == 'correct':
@@ -240,7 +307,7 @@ class ClozeQuestion(QuestionBase):
         data['full_text'] = self.full_text
         data['show_word_bank'] = self.show_word_bank
         data['case_sensitive'] = self.case_sensitive
-        data['cloze_blanks'] = [c.to_dict() for c in sorted(self.answer_components, key=lambda x: x.position)]
+        data['cloze_blanks'] = [c.to_dict() for c in self.answer_components]
         return data
 
 
@@ -252,45 +319,59 @@ class ClozeBlank(AnswerComponentBase):
     }
     
     correct_answer = db.Column(db.String(200), nullable=True)
-    alternate_answers = db.Column(db.Text, nullable=True)  # JSON array
+    alternate_answers = deferred(db.Column(db.JSON().with_variant(JSONB, 'postgresql'), nullable=True), group='body')  # list of strings
     char_position = db.Column(db.Integer, nullable=True)
     
+    # Grading caches, filled lazily on first use and reset whenever the
+    # blank is loaded from the database
+    _norm_correct = None
+    _alternates = None
+    _norm_alts = None
+    _typo_keys = None
+    
+    @reconstructor
+    def _init_on_load(self):
+        self._norm_correct = None
+        self._alternates = None
+        self._norm_alts = None
+        self._typo_keys = None
+    
+    def _parsed_alternates(self):
+        """Return alternate answers as a list of strings, computed once per load."""
+        if self._alternates is None:
+            alternates = self.alternate_answers
+            if isinstance(alternates, str):
+                # Rows written before the column became JSON hold an encoded string
+                try:
+                    alternates = json.loads(alternates)
+                except json.JSONDecodeError:
+                    alternates = []
+            if not isinstance(alternates, list):
+                alternates = []
+            self._alternates = [alt for alt in alternates if isinstance(alt, str)]
+        return self._alternates
+    
     def _normalize_answer(self, text):
         """Remove punctuation and normalize for comparison."""
-        import string
         # Remove leading/trailing punctuation
-        text = text.strip(string.punctuation + ' ')
-        return text.lower()
+        if text.isascii():
+            return text.strip(_PUNCT_STRIP).lower()
+        return _strip_unicode_punct(text).lower()
     
     def _is_typo(self, user_answer, correct_answer):
         """Check if user answer is close enough to be considered a typo using Levenshtein distance."""
-        user_answer = user_answer.lower().strip()
-        correct_answer = correct_answer.lower().strip()
-        
+        return self._is_typo_key(user_answer.lower().strip(), correct_answer.lower().strip())
+    
+    @staticmethod
+    def _is_typo_key(user_answer, correct_answer):
+        """Typo check for answers that are already lowercased and stripped."""
         # If answers are identical after normalization, it's correct
         if user_answer == correct_answer:
             return False
         
-        # Calculate Levenshtein distance
-        def levenshtein_distance(s1, s2):
-            if len(s1) < len(s2):
-                return levenshtein_distance(s2, s1)
-            if len(s2) == 0:
-                return len(s1)
-            
-            previous_row = range(len(s2) + 1)
-            for i, c1 in enumerate(s1):
-                current_row = [i + 1]
-                for j, c2 in enumerate(s2):
-                    insertions = previous_row[j + 1] + 1
-                    deletions = current_row[j] + 1
-                    substitutions = previous_row[j] + (c1 != c2)
-                    current_row.append(min(insertions, deletions, substitutions))
-                previous_row = current_row
-            
-            return previous_row[-1]
-        
-        distance = levenshtein_distance(user_answer, correct_answer)
+        # Levenshtein distance, computed in C; score_cutoff lets it bail out as
+        # soon as the distance exceeds 2 (anything beyond that is not a typo)
+        distance = Levenshtein.distance(user_answer, correct_answer, score_cutoff=2)
         max_length = max(len(user_answer), len(correct_answer))
         
         # Consider it a typo if:
@@ -308,10 +389,7 @@ class ClozeBlank(AnswerComponentBase):
         Check if user's answer matches the correct answer or any alternates.
         Returns: ('correct', 'typo', or 'incorrect')
         """
-        import json
-        
-        # Get the correct answer - support both old (word) and new (correct_answer) schema
-        correct = self.correct_answer or getattr(self, 'word', None)
+        correct = self.correct_answer
         
         if not correct:
             return 'incorrect'
@@ -322,60 +400,32 @@ class ClozeBlank(AnswerComponentBase):
         if not user_normalized:
             return 'incorrect'
         
-        # Normalize correct answer
-        correct_normalized = self._normalize_answer(correct)
+        if self._norm_correct is None:
+            self._norm_correct = self._normalize_answer(correct)
+        if self._norm_alts is None:
+            self._norm_alts = frozenset(self._normalize_answer(alt) for alt in self._parsed_alternates())
         
-        # Check exact match (after normalization)
-        if user_normalized == correct_normalized:
+        # Check exact match (after normalization) against correct answer and alternates
+        if user_normalized == self._norm_correct or user_normalized in self._norm_alts:
             return 'correct'
         
-        # Check alternates - support both old and new schema
-        alternates_json = self.alternate_answers or getattr(self, 'alternates', None)
-        if alternates_json:
-            try:
-                alternates = json.loads(alternates_json) if isinstance(alternates_json, str) else alternates_json
-                if alternates:
-                    for alt in alternates:
-                        alt_normalized = self._normalize_answer(alt)
-                        if user_normalized == alt_normalized:
-                            return 'correct'
-            except (json.JSONDecodeError, TypeError):
-                pass
-        
-        # Check if it's a typo of the correct answer
-        if self._is_typo(user_answer, correct):
-            return 'typo'
-        
-        # Check if it's a typo of any alternate
-        if alternates_json:
-            try:
-                alternates = json.loads(alternates_json) if isinstance(alternates_json, str) else alternates_json
-                if alternates:
-                    for alt in alternates:
-                        if self._is_typo(user_answer, alt):
-                            return 'typo'
-            except (json.JSONDecodeError, TypeError):
-                pass
+        # Check if it's a typo of the correct answer, then of any alternate
+        if self._typo_keys is None:
+            self._typo_keys = [correct.lower().strip()] + [
+                alt.lower().strip() for alt in self._parsed_alternates()
+            ]
+        user_key = user_answer.lower().strip()
+        for key in self._typo_keys:
+            if self._is_typo_key(user_key, key):
+                return 'typo'
         
         return 'incorrect'
     
     def to_dict(self):
         data = super().to_dict()
-        # Support both old (word) and new (correct_answer) schema
-        data['correct_answer'] = self.correct_answer or getattr(self, 'word', None)
+        data['correct_answer'] = self.correct_answer
         data['char_position'] = self.char_position
-        
-        # Include alternates - support both old and new schema
-        alternates_json = self.alternate_answers or getattr(self, 'alternates', None)
-        if alternates_json:
-            import json
-            try:
-                data['alternates'] = json.loads(alternates_json) if isinstance(alternates_json, str) else alternates_json
-            except (json.JSONDecodeError, TypeError):
-                data['alternates'] = []
-        else:
-            data['alternates'] = []
-        
+        data['alternates'] = list(self._parsed_alternates())
         return data
 
 
@@ -401,10 +451,10 @@ class WordMatchQuestion(QuestionBase):
             user_response: list of dicts with 'left' and 'right' indices (as strings)
             
         Returns:
-            tuple: (is_correct, feedback)
+            tuple: (is_correct, feedback, None)
         """
         if not isinstance(user_response, list):
-            return False, "Invalid response format"
+            return False, "Invalid response format", None
         
         # Frontend sends indices as strings, convert to int for comparison
         user_matches = set()
@@ -424,7 +474,7 @@ class WordMatchQuestion(QuestionBase):
         is_correct = correct_count == total_pairs
         feedback = f"Got {correct_count} out of {total_pairs} pairs correct."
         
-        return is_correct, feedback
+        return is_correct, feedback, None
     
     def to_dict(self):
         data = super().to_dict()
@@ -474,9 +524,17 @@ class User(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
     quizzes = db.relationship("Quiz", back_populates="creator", cascade="all, delete-orphan")
-    attempts = db.relationship("QuizAttempt", back_populates="user", cascade="all, delete-orphan")
-    items = db.relationship("UserItem", back_populates="user", cascade="all, delete-orphan")
-    saved_quizzes = db.relationship("SavedQuiz", back_populates="user", cascade="all, delete-orphan")
+    # Per-user history grows without bound and routes query it directly by
+    # user_id, so loading it through these collections is always a mistake
+    attempts = db.relationship("QuizAttempt", back_populates="user", cascade="all, delete-orphan", lazy="raise")
+    items = db.relationship("UserItem", back_populates="user", cascade="all, delete-orphan", lazy="raise")
+    saved_quizzes = db.relationship("SavedQuiz", back_populates="user", cascade="all, delete-orphan", lazy="raise")
+
+    # Usernames and emails are matched case-insensitively at login/register
+    __table_args__ = (
+        db.Index('ix_users_username_lower', db.func.lower(username), unique=True),
+        db.Index('ix_users_email_lower', db.func.lower(email), unique=True),
+    )
 
 
 class Quiz(db.Model):
@@ -491,43 +549,71 @@ class Quiz(db.Model):
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     creator = db.relationship("User", back_populates="quizzes")
+    # ORM cascades stay on: databases created before the ondelete FKs don't cascade themselves
     questions = db.relationship("QuestionBase", back_populates="quiz", 
                                cascade="all, delete-orphan", order_by="QuestionBase.position")
     attempts = db.relationship("QuizAttempt", back_populates="quiz", cascade="all, delete-orphan")
 
+    @classmethod
+    def load_for_grading(cls, quiz_id):
+        """
+        Load a quiz together with its questions and their answer components.
+        
+        Uses batched IN queries so grading every question costs a fixed number
+        of round trips instead of one query per question.  Any other
+        relationship access raises rather than lazy-loading once per row.
+        """
+        questions = with_polymorphic(QuestionBase, '*')
+        components = with_polymorphic(AnswerComponentBase, '*')
+        return cls.query.options(
+            selectinload(cls.questions.of_type(questions))
+            .selectinload(questions.answer_components.of_type(components))
+            .undefer_group('body')
+            .raiseload('*'),
+            raiseload('*'),
+        ).filter_by(id=quiz_id).first()
+
 
 class QuizAttempt(db.Model):
     __tablename__ = "quiz_attempts"
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False)
-    quiz_id = db.Column(db.Integer, db.ForeignKey("quizzes.id"), nullable=False)
+    quiz_id = db.Column(db.Integer, db.ForeignKey("quizzes.id", ondelete="CASCADE"), nullable=False)
     started_at = db.Column(db.DateTime, default=datetime.utcnow)
     completed_at = db.Column(db.DateTime, nullable=True)
     score = db.Column(db.Float, default=0.0)
+    # orjson-encoded payloads of a whole-quiz submission, stored as written
+    responses = deferred(db.Column(db.LargeBinary, nullable=True))
+    results = deferred(db.Column(db.LargeBinary, nullable=True))
 
     user = db.relationship("User", back_populates="attempts")
     quiz = db.relationship("Quiz", back_populates="attempts")
     answers = db.relationship("UserAnswer", back_populates="attempt", cascade="all, delete-orphan")
 
+    # my_progress filters by user; clear_quiz_results by user and quiz
+    __table_args__ = (db.Index('ix_quiz_attempts_user_quiz', 'user_id', 'quiz_id'),)
+
 
 class UserAnswer(db.Model):
     __tablename__ = "user_answers"
     id = db.Column(db.Integer, primary_key=True)
-    attempt_id = db.Column(db.Integer, db.ForeignKey("quiz_attempts.id"), nullable=False)
-    question_id = db.Column(db.Integer, db.ForeignKey("questions.id"), nullable=False)
-    user_response = db.Column(db.Text, nullable=True)  # JSON for complex responses
+    attempt_id = db.Column(db.Integer, db.ForeignKey("quiz_attempts.id", ondelete="CASCADE"), nullable=False)
+    question_id = db.Column(db.Integer, db.ForeignKey("questions.id", ondelete="CASCADE"), nullable=False)
+    user_response = deferred(db.Column(db.Text, nullable=True))  # JSON for complex responses
     was_correct = db.Column(db.Boolean, default=False)
     feedback = db.Column(db.Text, nullable=True)
 
     attempt = db.relationship("QuizAttempt", back_populates="answers")
     question = db.relationship("QuestionBase", back_populates="user_answers")
 
+    __table_args__ = (db.Index('ix_user_answers_attempt', 'attempt_id'),)
+
 
 class UserItem(db.Model):
     __tablename__ = "user_items"
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False)
-    question_id = db.Column(db.Integer, db.ForeignKey("questions.id"), nullable=False)
+    question_id = db.Column(db.Integer, db.ForeignKey("questions.id", ondelete="CASCADE"), nullable=False)
     next_review_date = db.Column(db.Date, nullable=True)
     ease_factor = db.Column(db.Float, default=2.5)
     interval_days = db.Column(db.Integer, default=0)
@@ -536,12 +622,15 @@ class UserItem(db.Model):
     user = db.relationship("User", back_populates="items")
     question = db.relationship("QuestionBase", foreign_keys=[question_id])
 
+    # One SRS record per user and question; also serves the per-submit lookup
+    __table_args__ = (db.Index('ix_user_items_user_question', 'user_id', 'question_id', unique=True),)
+
 
 class SavedQuiz(db.Model):
     __tablename__ = "saved_quizzes"
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False)
-    quiz_id = db.Column(db.Integer, db.ForeignKey("quizzes.id"), nullable=False)
+    quiz_id = db.Column(db.Integer, db.ForeignKey("quizzes.id", ondelete="CASCADE"), nullable=False)
     saved_at = db.Column(db.DateTime, default=datetime.utcnow)
 
     user = db.relationship("User", back_populates="saved_quizzes")
@@ -0,0 +1,45 @@
+"""
+JSON response helpers.
+
+ojson() is a drop-in for `jsonify(payload), status` that encodes with orjson.
+Unlike jsonify it does not sort keys, and dates/datetimes are written as
+ISO 8601 strings.
+
+ojson_stream() sends an iterable of items as a JSON array without building
+the whole list first, for endpoints whose result size grows with the data.
+"""
+
+import orjson
+from flask import current_app, stream_with_context
+
+# Items encoded per chunk handed to the WSGI server; one chunk per item
+# would cost a socket write each
+STREAM_CHUNK_ITEMS = 200
+
+
+def ojson(payload, status=200):
+    return current_app.response_class(orjson.dumps(payload), status=status, mimetype="application/json")
+
+
+def _json_array_chunks(items):
+    chunk = []
+    sep = b"["
+    for item in items:
+        chunk.append(orjson.dumps(item))
+        if len(chunk) == STREAM_CHUNK_ITEMS:
+            yield sep + b",".join(chunk)
+            chunk.clear()
+            sep = b","
+    if chunk:
+        yield sep + b",".join(chunk) + b"]"
+    elif sep == b"[":
+        yield b"[]"
+    else:
+        yield b"]"
+
+
+def ojson_stream(items, status=200):
+    """Stream `items` (any iterable, typically a generator over a query) as a JSON array."""
+    return current_app.response_class(
+        stream_with_context(_json_array_chunks(items)), status=status, mimetype="application/json"
+    )
@@ -1,10 +1,13 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, abort, current_app
 from flask_jwt_extended import jwt_required, get_jwt_identity
+from sqlalchemy import Integer, cast, func, insert, select, text
+from ..cache import get_quiz_questions, set_quiz_questions
 from ..extensions import db
 from ..models import Quiz, QuizAttempt, QuestionBase, UserAnswer, UserItem
-from ..srs import update_user_item_on_result
+from ..srs import update_user_item_on_result, upsert_user_item_result
 from datetime import datetime, date
 import json
+import orjson
 
 bp = Blueprint("attempts", __name__)
 
@@ -16,18 +19,68 @@ def start_attempt(quiz_id):
     if user is not None:
         user = int(user)
 
-    quiz = Quiz.query.get_or_404(quiz_id)
+    # The question list rarely changes, so serve it from the cache when possible
+    questions_json = get_quiz_questions(quiz_id)
+    if questions_json is None:
+        # Only question ids/types/prompts are needed: one outer-joined column
+        # query covers both the quiz's existence and its questions, and builds
+        # no ORM objects. A quiz without questions yields a single all-NULL row.
+        rows = db.session.execute(
+            select(QuestionBase.id, QuestionBase.type, QuestionBase.prompt_text)
+            .select_from(Quiz)
+            .outerjoin(QuestionBase, QuestionBase.quiz_id == Quiz.id)
+            .where(Quiz.id == quiz_id)
+            .order_by(QuestionBase.position, QuestionBase.id)
+        ).all()
+        if not rows:
+            abort(404)
+        questions_json = orjson.dumps([
+            {"id": qid, "type": qtype, "prompt_text": prompt}
+            for qid, qtype, prompt in rows if qid is not None
+        ])
+        set_quiz_questions(quiz_id, questions_json)
+
     # create attempt
-    attempt = QuizAttempt(user_id=user, quiz_id=quiz.id)
+    attempt = QuizAttempt(user_id=user, quiz_id=quiz_id)
     db.session.add(attempt)
     db.session.commit()
 
-    # return a simple payload with attempt id and questions
-    qlist = []
-    for q in quiz.questions:
-        qlist.append({"id": q.id, "type": q.type, "prompt_text": q.prompt_text})
+    # the question list is already encoded, so splice it in rather than re-encoding
+    body = b'{"attempt_id":%d,"questions":%b}' % (attempt.id, questions_json)
+    return current_app.response_class(body, status=201, mimetype="application/json")
+
+
+def _dump_client_json(value):
+    """
+    Encode client-supplied JSON to bytes.
+
+    orjson rejects integers outside the 64-bit range, which are still valid
+    JSON; fall back to the stdlib encoder for those rather than failing.
+    """
+    try:
+        return orjson.dumps(value)
+    except orjson.JSONEncodeError:
+        return json.dumps(value).encode()
+
+
+def _stored_response(response):
+    """The text stored in UserAnswer.user_response: strings as-is, anything else as JSON."""
+    return response if isinstance(response, str) else _dump_client_json(response).decode()
+
+
+def _grade(question, response):
+    """Validate a response polymorphically; returns (was_correct, feedback, details)."""
+    # Use polymorphic validation - works for all question types!
+    try:
+        was_correct, feedback, details = question.validate_answer(response)
+    except Exception as e:
+        # Fallback validation for edge cases
+        was_correct = False
+        feedback = f"Error validating answer: {str(e)}"
+        details = None
+        current_app.logger.exception("validation error for question %s", question.id)
 
-    return jsonify({"attempt_id": attempt.id, "questions": qlist}), 201
+    return was_correct, feedback, details
 
 
 @bp.post("/<int:attempt_id>/submit-question")
@@ -45,47 +98,35 @@ def submit_question(attempt_id):
     question_id = data.get("question_id")
     response = data.get("response")
 
-    question = QuestionBase.query.get_or_404(question_id)
+    question = QuestionBase.load_for_grading(question_id)
+    if question is None:
+        abort(404)
 
-    # Use polymorphic validation - works for all question types!
-    try:
-        result = question.validate_answer(response)
-        
-        # Handle both 2-tuple and 3-tuple returns (cloze returns 3 values)
-        if len(result) == 3:
-            was_correct, feedback, details = result
-        else:
-            was_correct, feedback = result
-            details = None
-            
-    except Exception as e:
-        # Fallback validation for edge cases
-        was_correct = False
-        feedback = f"Error validating answer: {str(e)}"
-        details = None
-        print(f"Validation error: {e}")
-        import traceback
-        traceback.print_exc()
+    was_correct, feedback, details = _grade(question, response)
 
-    print(f"User answered question {question.id} (type: {question.type}) with response {response}. Correct: {was_correct} Feedback: {feedback}")
+    current_app.logger.debug("answered question %s (type %s) correct=%s", question.id, question.type, was_correct)
 
     ua = UserAnswer(
         attempt_id=attempt.id, 
         question_id=question.id, 
-        user_response=json.dumps(response) if not isinstance(response, str) else response, 
+        user_response=_stored_response(response), 
         was_correct=was_correct,
         feedback=feedback
     )
     db.session.add(ua)
 
-    # update or create UserItem
-    item = UserItem.query.filter_by(user_id=user, question_id=question.id).first()
-    if not item:
-        item = UserItem(user_id=user, question_id=question.id)
-        db.session.add(item)
-        db.session.flush()
+    # update or create UserItem, in one statement where the database supports upserts
+    upsert = upsert_user_item_result(db.engine.dialect.name, user, question.id, was_correct)
+    if upsert is not None:
+        db.session.execute(upsert)
+    else:
+        item = UserItem.query.filter_by(user_id=user, question_id=question.id).first()
+        if not item:
+            item = UserItem(user_id=user, question_id=question.id)
+            db.session.add(item)
+            db.session.flush()
 
-    update_user_item_on_result(item, was_correct)
+        update_user_item_on_result(item, was_correct)
 
     db.session.commit()
 
@@ -96,6 +137,83 @@ def submit_question(attempt_id):
     return jsonify(response_data), 200
 
 
+@bp.post("/<int:attempt_id>/submit-bulk")
+@jwt_required()
+def submit_bulk(attempt_id):
+    """
+    Submit several answers at once.
+
+    Expects {"answers": [{"question_id": ..., "response": ...}, ...]}. All
+    questions are loaded in one query and every answer and SRS update is
+    written in a single transaction, instead of one commit per answer.
+    """
+    user = get_jwt_identity()
+    if user is not None:
+        user = int(user)
+
+    attempt = QuizAttempt.query.get_or_404(attempt_id)
+    if attempt.user_id != user:
+        return jsonify({"msg": "forbidden"}), 403
+
+    data = request.get_json() or {}
+    answers = data.get("answers") or []
+    if not isinstance(answers, list) or not all(isinstance(a, dict) for a in answers):
+        return jsonify({"msg": "answers must be a list of objects"}), 400
+
+    # ids must be plain ints: anything else is unhashable or can never match a question
+    if not all(type(a.get("question_id")) is int for a in answers):
+        return jsonify({"msg": "question_id must be an integer"}), 400
+
+    question_ids = {a["question_id"] for a in answers}
+    questions = {q.id: q for q in QuestionBase.load_many_for_grading(question_ids, attempt.quiz_id)}
+    if len(questions) != len(question_ids):
+        return jsonify({"msg": "unknown question for this attempt"}), 400
+
+    items = {
+        item.question_id: item
+        for item in UserItem.query.filter(
+            UserItem.user_id == user, UserItem.question_id.in_(question_ids)
+        )
+    }
+
+    answer_rows = []
+    results = []
+    for a in answers:
+        question = questions[a["question_id"]]
+        response = a.get("response")
+        was_correct, feedback, details = _grade(question, response)
+
+        answer_rows.append({
+            "attempt_id": attempt.id,
+            "question_id": question.id,
+            "user_response": _stored_response(response),
+            "was_correct": was_correct,
+            "feedback": feedback,
+        })
+
+        item = items.get(question.id)
+        if item is None:
+            item = UserItem(user_id=user, question_id=question.id,
+                            ease_factor=2.5, interval_days=0, success_streak=0)
+            db.session.add(item)
+            items[question.id] = item
+        update_user_item_on_result(item, was_correct)
+
+        result = {"question_id": question.id, "correct": was_correct}
+        if details:
+            result["details"] = details
+        results.append(result)
+
+    if db.engine.dialect.name == "postgresql":
+        # Losing the last few answers in a server crash is acceptable; waiting on WAL flush is not
+        db.session.execute(text("SET LOCAL synchronous_commit TO OFF"))
+    if answer_rows:
+        db.session.execute(insert(UserAnswer), answer_rows)
+    db.session.commit()
+
+    return jsonify({"results": results}), 200
+
+
 @bp.post("/<int:attempt_id>/finish")
 @jwt_required()
 def finish_attempt(attempt_id):
@@ -109,19 +227,20 @@ def finish_attempt(attempt_id):
 
     attempt.completed_at = datetime.utcnow()
 
-    # compute score
-    total = len(attempt.answers)
-    if total:
-        correct = sum(1 for a in attempt.answers if a.was_correct)
-        attempt.score = correct / total
-    else:
-        attempt.score = 0.0
+    # compute score in the database rather than loading every answer row
+    total, correct = db.session.execute(
+        select(
+            func.count(UserAnswer.id),
+            func.coalesce(func.sum(cast(UserAnswer.was_correct, Integer)), 0),
+        ).where(UserAnswer.attempt_id == attempt.id)
+    ).one()
+    attempt.score = correct / total if total else 0.0
 
     db.session.commit()
     return jsonify({
         "attempt_id": attempt.id, 
         "score": attempt.score,
-        "correct": sum(1 for a in attempt.answers if a.was_correct),
+        "correct": correct,
         "total": total
     }), 200
 
@@ -130,56 +249,52 @@ def finish_attempt(attempt_id):
 @jwt_required()
 def submit_attempt(quiz_id):
     """Submit a quiz attempt and get results."""
-    user_id = get_jwt_identity()
-    data = request.get_json()
+    user_id = int(get_jwt_identity())
+    data = request.get_json() or {}
     responses = data.get('responses', {})
     
-    quiz = Quiz.query.get_or_404(quiz_id)
+    quiz = Quiz.load_for_grading(quiz_id)
+    if quiz is None:
+        abort(404)
     
     # Calculate score
     total_questions = len(quiz.questions)
     correct_count = 0
-    results = []
+    results = [None] * total_questions
     
-    for question in quiz.questions:
+    for i, question in enumerate(quiz.questions):
         user_response = responses.get(str(question.id))
-        
-        if question.question_type == 'cloze':
-            is_correct, feedback, details = question.validate_answer(user_response or {})
-            results.append({
-                'question_id': question.id,
-                'is_correct': is_correct,
-                'feedback': feedback,
-                'details': details  # Include per-blank validation details
-            })
-        else:
-            is_correct, feedback = question.validate_answer(user_response)
-            results.append({
-                'question_id': question.id,
-                'is_correct': is_correct,
-                'feedback': feedback
-            })
+        is_correct, feedback, details = _grade(question, user_response)
+        result = {
+            'question_id': question.id,
+            'is_correct': is_correct,
+            'feedback': feedback
+        }
+        if details is not None:
+            result['details'] = details  # Include per-blank validation details
+        results[i] = result
         
         if is_correct:
             correct_count += 1
     
     score = (correct_count / total_questions * 100) if total_questions > 0 else 0
     
+    # Encode the results once: the same bytes are stored and sent back
+    # (details may echo the client's answers, so use the client-safe encoder)
+    results_json = _dump_client_json(results)
+    
     # Save attempt
     attempt = QuizAttempt(
         user_id=user_id,
         quiz_id=quiz_id,
         score=score,
-        responses=json.dumps(responses),
-        results=json.dumps(results)
+        responses=_dump_client_json(responses),
+        results=results_json
     )
     db.session.add(attempt)
     db.session.commit()
     
-    return jsonify({
-        'attempt_id': attempt.id,
-        'score': score,
-        'correct_count': correct_count,
-        'total_questions': total_questions,
-        'results': results
-    }), 201
+    body = b'{"attempt_id":%d,"score":%b,"correct_count":%d,"total_questions":%d,"results":%b}' % (
+        attempt.id, orjson.dumps(score), correct_count, total_questions, results_json
+    )
+    return current_app.response_class(body, status=201, mimetype="application/json")
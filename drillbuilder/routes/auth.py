@@ -1,12 +1,79 @@
-from flask import Blueprint, request, jsonify
-from werkzeug.security import generate_password_hash, check_password_hash
+from flask import Blueprint, current_app, request, jsonify
+from argon2 import PasswordHasher
+from argon2.exceptions import InvalidHashError, VerifyMismatchError
+from werkzeug.security import check_password_hash
 from flask_jwt_extended import create_access_token, jwt_required, get_jwt_identity
+from sqlalchemy import func
+import orjson
+from ..cache import get_login_user, invalidate_login_user, set_login_user
 from ..extensions import db
 from ..models import User
 
 bp = Blueprint("auth", __name__)
 
 
+def _password_hasher():
+    """
+    The app's argon2id hasher (libargon2, C), built from ARGON2_* config on first use.
+
+    Hashes created before the switch to argon2 are Werkzeug hashes and get
+    upgraded on the user's next successful login.
+    """
+    hasher = current_app.extensions.get("password_hasher")
+    if hasher is None:
+        hasher = current_app.extensions["password_hasher"] = PasswordHasher(
+            time_cost=current_app.config["ARGON2_TIME_COST"],
+            memory_cost=current_app.config["ARGON2_MEMORY_COST"],
+            parallelism=1,
+        )
+    return hasher
+
+
+def hash_password(password):
+    return _password_hasher().hash(password)
+
+
+def verify_password(user, password):
+    """Check a password against user.password_hash, re-hashing legacy or outdated hashes."""
+    if not user.password_hash.startswith("$argon2"):
+        if not check_password_hash(user.password_hash, password):
+            return False
+        _set_password_hash(user, hash_password(password))
+        return True
+
+    hasher = _password_hasher()
+    try:
+        hasher.verify(user.password_hash, password)
+    except (VerifyMismatchError, InvalidHashError):
+        return False
+
+    if hasher.check_needs_rehash(user.password_hash):
+        _set_password_hash(user, hash_password(password))
+    return True
+
+
+def _set_password_hash(user, pw_hash):
+    user.password_hash = pw_hash
+    db.session.commit()
+    invalidate_login_user(user.username, user.email)
+
+
+def _verify_cached_login(record, password):
+    """
+    Check a password against a cached login record.
+    Returns True/False, or None when the cached hash is outdated and the
+    database path (which re-hashes) should handle the login instead.
+    """
+    hasher = _password_hasher()
+    try:
+        hasher.verify(record["password_hash"], password)
+    except (VerifyMismatchError, InvalidHashError):
+        return False
+    if hasher.check_needs_rehash(record["password_hash"]):
+        return None
+    return True
+
+
 @bp.post("/register")
 def register():
     data = request.get_json() or {}
@@ -16,11 +83,15 @@ def register():
 
     if not username or not email or not password:
         return jsonify({"msg": "username, email and password are required"}), 400
+    if not all(isinstance(value, str) for value in (username, email, password)):
+        return jsonify({"msg": "username, email and password must be strings"}), 400
 
-    if User.query.filter((User.username == username) | (User.email == email)).first():
+    if User.query.filter(
+        (func.lower(User.username) == username.lower()) | (func.lower(User.email) == email.lower())
+    ).first():
         return jsonify({"msg": "user with username or email already exists"}), 400
 
-    pw_hash = generate_password_hash(password)
+    pw_hash = hash_password(password)
     user = User(username=username, email=email, password_hash=pw_hash)
     db.session.add(user)
     db.session.commit()
@@ -36,12 +107,30 @@ def login():
 
     if not username_or_email or not password:
         return jsonify({"msg": "username/email and password required"}), 400
+    if not isinstance(username_or_email, str) or not isinstance(password, str):
+        return jsonify({"msg": "username/email and password must be strings"}), 400
 
-    user = User.query.filter((User.username == username_or_email) | (User.email == username_or_email)).first()
+    # Recently seen logins are answered from the cache without touching the database
+    cached = get_login_user(username_or_email)
+    if cached is not None:
+        record = orjson.loads(cached)
+        verified = _verify_cached_login(record, password)
+        if verified is False:
+            return jsonify({"msg": "invalid credentials"}), 401
+        if verified:
+            access_token = create_access_token(identity=str(record["id"]))
+            return jsonify({"access_token": access_token, "user": {"id": record["id"], "username": record["username"]}})
 
-    if not user or not check_password_hash(user.password_hash, password):
+    ident = username_or_email.lower()
+    user = User.query.filter((func.lower(User.username) == ident) | (func.lower(User.email) == ident)).first()
+
+    if not user or not verify_password(user, password):
         return jsonify({"msg": "invalid credentials"}), 401
 
+    set_login_user(username_or_email, orjson.dumps(
+        {"id": user.id, "username": user.username, "password_hash": user.password_hash}
+    ))
+
     # jwt identity must be a serializable string used for the subject claim
     access_token = create_access_token(identity=str(user.id))
     return jsonify({"access_token": access_token, "user": {"id": user.id, "username": user.username}})
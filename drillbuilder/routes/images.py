@@ -3,31 +3,50 @@ Image upload and management routes.
 Handles uploading, processing, and serving images for questions and answer components.
 """
 
-from flask import Blueprint, request, jsonify, send_from_directory, current_app
+from flask import Blueprint, request, jsonify, send_from_directory, current_app, Response
 from flask_jwt_extended import jwt_required, get_jwt_identity
+from werkzeug.exceptions import NotFound
 from werkzeug.utils import secure_filename
 from PIL import Image
+import io
 import os
 import uuid
 from datetime import datetime
 
+try:
+    import pyvips
+except (ImportError, OSError):  # pyvips or the libvips shared library is missing
+    pyvips = None
+
 bp = Blueprint("images", __name__)
 
-ALLOWED_EXTENSIONS = {'jpg', 'jpeg'}
+ALLOWED_EXTENSIONS = frozenset({'jpg', 'jpeg'})
+JPEG_MAGIC = b'\xff\xd8\xff'  # SOI marker + first segment marker
 MAX_SIZE = (200, 200)  # Max dimensions for resized images
 UPLOAD_FOLDER = 'instance/uploads'
+MAX_UPLOAD_BYTES = 5 * 1024 * 1024  # Largest accepted upload, before processing
+# Uploaded filenames are random UUIDs and never rewritten, so clients may cache them forever
+IMAGE_MAX_AGE = 31536000
+IMAGE_CACHE_CONTROL = f'public, max-age={IMAGE_MAX_AGE}, immutable'
+
+# Absolute uploads path for serving, resolved once (same location as
+# current_app.root_path/../UPLOAD_FOLDER)
+_UPLOAD_ABS = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', UPLOAD_FOLDER))
 
 def allowed_file(filename):
     """Check if file has allowed extension."""
-    return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
+    return os.path.splitext(filename)[1].lower().lstrip('.') in ALLOWED_EXTENSIONS
 
-def process_image(file_path):
+def process_image(data, file_path):
     """
-    Process uploaded image: resize, compress, optimize.
-    Returns the processed file path.
+    Process uploaded image bytes: resize, compress, optimize.
+    Writes the resulting JPEG to file_path; returns True on success.
     """
     try:
-        with Image.open(file_path) as img:
+        if pyvips is not None:
+            return _process_image_vips(data, file_path)
+
+        with Image.open(io.BytesIO(data)) as img:
             # Convert to RGB if necessary (handles PNG with alpha, etc.)
             if img.mode in ('RGBA', 'LA', 'P'):
                 # Create white background
@@ -47,9 +66,20 @@ def process_image(file_path):
             
         return True
     except Exception as e:
-        print(f"Error processing image: {e}")
+        current_app.logger.warning("error processing image: %s", e)
         return False
 
+def _process_image_vips(data, file_path):
+    """
+    libvips version of process_image: shrink-on-load thumbnail and a
+    libjpeg-turbo encode, without decoding the full image into memory.
+    """
+    img = pyvips.Image.thumbnail_buffer(data, MAX_SIZE[0], height=MAX_SIZE[1], size='down')
+    if img.hasalpha():
+        img = img.flatten(background=[255, 255, 255])
+    img.jpegsave(file_path, Q=85, optimize_coding=True, strip=True)
+    return True
+
 @bp.post("/upload")
 @jwt_required()
 def upload_image():
@@ -57,6 +87,11 @@ def upload_image():
     Upload and process an image.
     Returns the image URL on success.
     """
+    # Reject oversized uploads before the multipart body is parsed
+    # (allowing some headroom for the multipart framing around the file)
+    if request.content_length and request.content_length > MAX_UPLOAD_BYTES + 64 * 1024:
+        return jsonify({"msg": "Image is too large"}), 413
+
     if 'image' not in request.files:
         return jsonify({"msg": "No image file provided"}), 400
     
@@ -69,6 +104,15 @@ def upload_image():
         return jsonify({"msg": "Only .jpg and .jpeg files are allowed"}), 400
     
     try:
+        # The raw upload is only needed as processing input, so keep it in memory
+        data = file.stream.read(MAX_UPLOAD_BYTES + 1)
+        if len(data) > MAX_UPLOAD_BYTES:
+            return jsonify({"msg": "Image is too large"}), 413
+
+        # Reject non-JPEG content before it reaches a decoder
+        if not data.startswith(JPEG_MAGIC):
+            return jsonify({"msg": "File is not a JPEG image"}), 400
+
         # Generate unique filename
         original_filename = secure_filename(file.filename)
         extension = original_filename.rsplit('.', 1)[1].lower()
@@ -77,13 +121,11 @@ def upload_image():
         # Ensure upload directory exists
         os.makedirs(UPLOAD_FOLDER, exist_ok=True)
         
-        # Save file
+        # Process image (resize, compress) straight to its final location
         file_path = os.path.join(UPLOAD_FOLDER, unique_filename)
-        file.save(file_path)
-        
-        # Process image (resize, compress)
-        if not process_image(file_path):
-            os.remove(file_path)
+        if not process_image(data, file_path):
+            if os.path.exists(file_path):
+                os.remove(file_path)
             return jsonify({"msg": "Error processing image"}), 500
         
         # Return URL
@@ -103,17 +145,25 @@ def serve_image(filename):
     """Serve uploaded images."""
     # Security: ensure filename is safe
     safe_filename = secure_filename(filename)
+
+    # Behind nginx, hand the file transfer to the proxy (it answers 404 itself)
+    accel_prefix = current_app.config.get('IMAGES_ACCEL_REDIRECT')
+    if accel_prefix:
+        response = Response(mimetype='image/jpeg')
+        response.headers['X-Accel-Redirect'] = f"{accel_prefix.rstrip('/')}/{safe_filename}"
+        response.headers['Cache-Control'] = IMAGE_CACHE_CONTROL
+        return response
     
-    # Get absolute path to upload folder
-    upload_path = os.path.join(current_app.root_path, '..', UPLOAD_FOLDER)
-    upload_path = os.path.abspath(upload_path)
-    
-    # Check if file exists
-    file_path = os.path.join(upload_path, safe_filename)
-    if not os.path.exists(file_path):
+    # send_from_directory does the existence check itself; conditional
+    # requests get a bodiless 304 when the client's copy is current
+    try:
+        response = send_from_directory(_UPLOAD_ABS, safe_filename, conditional=True, max_age=IMAGE_MAX_AGE)
+    except NotFound:
         return jsonify({"msg": "Image not found"}), 404
-    
-    return send_from_directory(upload_path, safe_filename)
+    # Only touch headers: the body is a wsgi.file_wrapper (sendfile under
+    # gunicorn) and reading or wrapping it would copy it through Python
+    response.cache_control.immutable = True
+    return response
 
 @bp.delete("/delete/<filename>")
 @jwt_required()
@@ -1,107 +1,189 @@
-from flask import Blueprint, request, jsonify
+from datetime import datetime
+from functools import lru_cache
+import time
+import orjson
+from flask import Blueprint, abort, request, current_app
 from flask_jwt_extended import jwt_required, get_jwt_identity
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import selectinload, undefer_group, with_polymorphic
+from ..cache import invalidate_quiz_questions
 from ..extensions import db
-from ..models import (Quiz, QuestionBase, MultipleChoiceQuestion, ClozeQuestion, 
+from ..responses import ojson, ojson_stream
+from ..models import (Quiz, QuestionBase, AnswerComponentBase, MultipleChoiceQuestion, ClozeQuestion, 
                       WordMatchQuestion, MCQOption, ClozeBlank, WordMatchPair,
-                      User, SavedQuiz, Language, UserItem, QuizAttempt)
+                      User, SavedQuiz, Language, UserItem, QuizAttempt, UserAnswer)
+from ..schemas.compiled import compile_dump
 from ..schemas.quiz import QuizInput, QuizOut, QuestionInput
 
 bp = Blueprint("quizzes", __name__)
 
+# Rows fetched per round trip while streaming the quiz listings
+LIST_BATCH_SIZE = 200
+
+LANGUAGES_TTL = 300  # seconds
+
+# Schemas hold no per-request state, so build each once instead of per call
+_QUIZ_INPUT = QuizInput()
+_QUESTION_INPUT = QuestionInput()
+# QuizOut().dump(q) as one dict literal; q may be a Quiz or a result row
+_dump_quiz = compile_dump(QuizOut)
+
 
 @bp.get("/languages")
 def list_languages():
     """List all available languages"""
-    languages = Language.query.order_by(Language.name).all()
-    return jsonify([{"code": lang.code, "name": lang.name} for lang in languages])
+    # Reference data that only changes when the seed script runs, so the
+    # encoded list is kept per app and rebuilt every LANGUAGES_TTL seconds
+    cached = current_app.extensions.get("languages_cache")
+    now = time.monotonic()
+    if cached is not None and cached[0] > now:
+        payload = cached[1]
+    else:
+        languages = db.session.query(Language.code, Language.name).order_by(Language.name).all()
+        payload = orjson.dumps([{"code": code, "name": name} for code, name in languages])
+        if languages:  # an unseeded table should not stick for the whole TTL
+            current_app.extensions["languages_cache"] = (now + LANGUAGES_TTL, payload)
+    return current_app.response_class(payload, mimetype="application/json")
+
+
+def _uid(identity):
+    """Parse the JWT identity (a user id string) to an int; None if absent or malformed."""
+    if identity and identity.isdecimal():
+        return int(identity)
+    return None
+
+
+# The columns _dump_quiz reads; list endpoints select just these rather than whole Quiz rows
+_LIST_COLUMNS = (Quiz.id, Quiz.title, Quiz.description, Quiz.language, Quiz.is_public, Quiz.creator_id)
+
+
+def _owned_quiz(quiz_id, user_id):
+    """Fetch a quiz only if user_id created it, in one query; None if missing or not theirs."""
+    return Quiz.query.filter(Quiz.id == quiz_id, Quiz.creator_id == user_id).first()
+
+
+def _not_owned(quiz_id):
+    """Response for a quiz the caller may not modify: 404 if it does not exist, else 403."""
+    if db.session.query(Quiz.id).filter(Quiz.id == quiz_id).first() is None:
+        abort(404)
+    return ojson({"msg": "forbidden"}, 403)
+
+
+def _quiz_rows(quizzes, language_names, *, with_creator=False, mine_for=False, user_id=None, saved_ids=None):
+    """
+    Yield the listing dict for each quiz row, shared by the three list endpoints.
+
+    with_creator adds "creator_username" (the query must select User.username),
+    mine_for adds "is_mine" against user_id, and saved_ids adds "is_saved".
+    """
+    for q in quizzes.yield_per(LIST_BATCH_SIZE):
+        quiz_data = _dump_quiz(q)
+        if with_creator:
+            quiz_data['creator_username'] = q.username or 'Unknown'
+        if mine_for:
+            quiz_data['is_mine'] = (user_id is not None and q.creator_id == user_id)
+        if q.language:
+            quiz_data['language_name'] = language_names.get(q.language, q.language)
+        if saved_ids is not None:
+            quiz_data['is_saved'] = q.id in saved_ids
+        yield quiz_data
+
+
+def _language_names(quiz_query):
+    """Map the language codes used by the quizzes a query selects to display names, in one query."""
+    codes = quiz_query.with_entities(Quiz.language).filter(Quiz.language.isnot(None)).distinct()
+    return dict(db.session.query(Language.code, Language.name).filter(Language.code.in_(codes)).all())
 
 
 @bp.get("/")
 @jwt_required(optional=True)
 def list_quizzes():
     # list public drills and optionally include the user's own private drills
-    current_user = get_jwt_identity()
-    if current_user is not None:
-        try:
-            current_user = int(current_user)
-        except Exception:
-            current_user = None
+    current_user = _uid(get_jwt_identity())
     
-    quizzes = Quiz.query.filter((Quiz.is_public == True) | (Quiz.creator_id == current_user)).all()
-    result = []
+    quizzes = db.session.query(*_LIST_COLUMNS).filter((Quiz.is_public == True) | (Quiz.creator_id == current_user))
+    language_names = _language_names(quizzes)
     
-    for q in quizzes:
-        quiz_data = QuizOut().dump(q)
-        quiz_data['is_mine'] = (current_user is not None and q.creator_id == current_user)
-        
-        # Add language name
-        if q.language:
-            lang = Language.query.get(q.language)
-            quiz_data['language_name'] = lang.name if lang else q.language
-        
-        result.append(quiz_data)
-    
-    return jsonify(result)
+    return ojson_stream(_quiz_rows(quizzes, language_names, mine_for=True, user_id=current_user))
+
+
+def _get_anon_user_id():
+    """
+    Return the id of the reserved "anonymous" user, creating the account if needed.
+
+    The id never changes once the account is committed, so it is cached in
+    app.extensions and later anonymous requests skip the lookup entirely.
+    """
+    anon_id = current_app.extensions.get("anon_user_id")
+    if anon_id is not None:
+        return anon_id
+
+    # In dev mode the DB tables may not exist yet; create_all is used as a safe fallback
+    from sqlalchemy.exc import OperationalError
+
+    try:
+        anon = User.query.filter_by(username="anonymous").first()
+    except OperationalError:
+        # Likely the app was just started and the DB schema isn't created yet.
+        # Create missing tables (useful for local dev / demo). In production you should use migrations.
+        db.create_all()
+        anon = User.query.filter_by(username="anonymous").first()
+
+    if not anon:
+        # only flushed here; it is cached on the next request, once committed
+        anon = User(username="anonymous", email="anonymous@example.com", password_hash="<anon>")
+        db.session.add(anon)
+        db.session.flush()
+        return anon.id
+
+    current_app.extensions["anon_user_id"] = anon.id
+    return anon.id
 
 
 @bp.post("/")
 @jwt_required(optional=True)
 def create_quiz():
     data = request.get_json() or {}
-    validated = QuizInput().load(data)
-    user_id = get_jwt_identity()
-    if user_id is not None:
-        try:
-            user_id = int(user_id)
-        except Exception:
-            user_id = None
+    validated = _QUIZ_INPUT.load(data)
+    user_id = _uid(get_jwt_identity())
 
     # If the request is anonymous (no JWT), create drills under a reserved anonymous user account
     if not user_id:
-        # Try to look up or create a reserved "anonymous" user.
-        # In dev mode the DB tables may not exist yet; create_all is used as a safe fallback
-        from ..models import User
-        from sqlalchemy.exc import OperationalError
-
-        try:
-            anon = User.query.filter_by(username="anonymous").first()
-        except OperationalError:
-            # Likely the app was just started and the DB schema isn't created yet.
-            # Create missing tables (useful for local dev / demo). In production you should use migrations.
-            db.create_all()
-            anon = User.query.filter_by(username="anonymous").first()
-
-        if not anon:
-            anon = User(username="anonymous", email="anonymous@example.com", password_hash="<anon>")
-            db.session.add(anon)
-            db.session.flush()
-
-        user_id = anon.id
+        user_id = _get_anon_user_id()
 
     quiz = Quiz(creator_id=user_id, **validated)
     db.session.add(quiz)
     db.session.commit()
-    return jsonify(QuizOut().dump(quiz)), 201
-
-
-@bp.get("/<int:quiz_id>")
-@jwt_required(optional=True)
-def get_quiz(quiz_id):
-    quiz = Quiz.query.get_or_404(quiz_id)
-    if not quiz.is_public:
-        current_user = get_jwt_identity()
-        if current_user is not None:
-            try:
-                current_user = int(current_user)
-            except Exception:
-                current_user = None
-        if current_user != quiz.creator_id:
-            return jsonify({"msg": "forbidden"}), 403
-
-    out = QuizOut().dump(quiz)
+    return ojson(_dump_quiz(quiz), 201)
+
+
+@lru_cache(maxsize=1024)
+def _quiz_payload(quiz_id, updated_at):
+    """
+    Build the get_quiz payload (quiz fields plus serialized questions) as JSON bytes.
+
+    Cached per (quiz id, updated_at): editing a quiz or its questions bumps
+    updated_at, so stale entries are never looked up again and simply age out.
+    Caching the encoded bytes means a hit skips both dict building and encoding.
+    """
+    quiz = db.session.get(Quiz, quiz_id)
+    # Questions and components are of mixed subclasses, so load every
+    # subclass's columns up front rather than lazily per row
+    questions_poly = with_polymorphic(QuestionBase, '*')
+    components_poly = with_polymorphic(AnswerComponentBase, '*')
+    questions = (db.session.query(questions_poly)
+                 .options(undefer_group('body'),
+                          selectinload(questions_poly.answer_components.of_type(components_poly))
+                          .undefer_group('body'))
+                 .filter(questions_poly.quiz_id == quiz_id)
+                 .order_by(questions_poly.position, questions_poly.id)
+                 .all())
+
+    out = _dump_quiz(quiz)
     # include questions using polymorphic to_dict()
     out["questions"] = []
-    for q in quiz.questions:
+    for q in questions:
         qdata = q.to_dict()
         
         # For backward compatibility with frontend, restructure some fields
@@ -109,69 +191,75 @@ def get_quiz(quiz_id):
             # Frontend expects 'options' key
             pass  # Already in qdata from MultipleChoiceQuestion.to_dict()
         elif q.type == "cloze":
-            # Frontend expects nested 'cloze_question' structure
+            # Frontend expects nested 'cloze_question' structure (replacing the flat fields)
+            blanks = qdata.pop("cloze_blanks", [])
             qdata["cloze_question"] = {
-                "full_text": qdata.get("full_text"),
-                "word_bank": qdata.get("show_word_bank"),
-                "cloze_words": []
+                "full_text": qdata.pop("full_text", None),
+                "word_bank": qdata.pop("show_word_bank", None),
+                "cloze_words": [
+                    {
+                        "word": blank["correct_answer"],
+                        "char_position": blank["char_position"],
+                        "alternates": blank.get("alternates", [])
+                    }
+                    for blank in blanks
+                ]
             }
-            for blank in qdata.get("cloze_blanks", []):
-                qdata["cloze_question"]["cloze_words"].append({
-                    "word": blank.get("correct_answer"),
-                    "char_position": blank.get("char_position"),
-                    "alternates": blank.get("alternates", [])
-                })
-            # Remove redundant fields
-            qdata.pop("full_text", None)
-            qdata.pop("show_word_bank", None)
-            qdata.pop("cloze_blanks", None)
         
         out["questions"].append(qdata)
 
-    return jsonify(out)
+    return orjson.dumps(out)
 
 
-@bp.post("/<int:quiz_id>/questions")
-@jwt_required()
-def add_question(quiz_id):
+@bp.get("/<int:quiz_id>")
+@jwt_required(optional=True)
+def get_quiz(quiz_id):
     quiz = Quiz.query.get_or_404(quiz_id)
-    user_id = get_jwt_identity()
-    if user_id is not None:
-        user_id = int(user_id)
-    if quiz.creator_id != user_id:
-        return jsonify({"msg": "forbidden"}), 403
+    if not quiz.is_public:
+        current_user = _uid(get_jwt_identity())
+        if current_user != quiz.creator_id:
+            return ojson({"msg": "forbidden"}, 403)
 
-    data = request.get_json() or {}
-    validated = QuestionInput().load(data)
-    import json
-    
+    return current_app.response_class(_quiz_payload(quiz.id, quiz.updated_at),
+                                      mimetype="application/json")
+
+
+def _build_question(quiz_id, validated):
+    """
+    Turn validated QuestionInput data into an unsaved question plus its components.
+
+    Returns (question, component class, component rows without question_id),
+    or None for an unsupported type. Components are inserted in bulk by the
+    caller once the question has an id.
+    """
     question_type = validated["type"]
     
     # Create appropriate question subclass
     if question_type == "multiple_choice":
         q = MultipleChoiceQuestion(
-            quiz_id=quiz.id,
+            quiz_id=quiz_id,
             prompt_text=validated["prompt_text"],
             prompt_image_url=validated.get("prompt_image_url"),
             answer_explanation=validated.get("answer_explanation"),
             allow_multiple=False,
             randomize_order=True
         )
-        # Add MCQ options as answer components
-        if validated.get("mcq_options"):
-            for idx, opt in enumerate(validated["mcq_options"]):
-                option = MCQOption(
-                    text=opt["text"],
-                    is_correct=opt.get("is_correct", False),
-                    image_url=opt.get("image_url"),
-                    position=idx
-                )
-                q.answer_components.append(option)
+        # MCQ options become answer components
+        component_cls = MCQOption
+        component_rows = [
+            {
+                "text": opt["text"],
+                "is_correct": opt.get("is_correct", False),
+                "image_url": opt.get("image_url"),
+                "position": idx
+            }
+            for idx, opt in enumerate(validated.get("mcq_options") or [])
+        ]
     
     elif question_type == "cloze":
         cloze_data = validated.get("cloze_data", {})
         q = ClozeQuestion(
-            quiz_id=quiz.id,
+            quiz_id=quiz_id,
             prompt_text=validated["prompt_text"],
             prompt_image_url=validated.get("prompt_image_url"),
             answer_explanation=validated.get("answer_explanation"),
@@ -179,234 +267,302 @@ def add_question(quiz_id):
             show_word_bank=cloze_data.get("word_bank", False),
             case_sensitive=False
         )
-        # Add cloze blanks as answer components
-        for idx, blank in enumerate(cloze_data.get("blanks", [])):
-            alternates = blank.get("alternates", [])
-            alternates_json = json.dumps(alternates) if alternates else None
-            cloze_blank = ClozeBlank(
-                correct_answer=blank["word"],
-                char_position=blank["char_position"],
-                alternate_answers=alternates_json,
-                position=idx
-            )
-            q.answer_components.append(cloze_blank)
+        # Cloze blanks become answer components
+        component_cls = ClozeBlank
+        component_rows = [
+            {
+                "correct_answer": blank["word"],
+                "char_position": blank["char_position"],
+                "alternate_answers": blank.get("alternates") or None,
+                "position": idx
+            }
+            for idx, blank in enumerate(cloze_data.get("blanks", []))
+        ]
     
     elif question_type == "word_match":
         q = WordMatchQuestion(
-            quiz_id=quiz.id,
+            quiz_id=quiz_id,
             prompt_text=validated["prompt_text"],
             prompt_image_url=validated.get("prompt_image_url"),
             answer_explanation=validated.get("answer_explanation"),
             match_type="word_to_word",
             randomize_right=True
         )
-        # Add word pairs as answer components
-        if validated.get("word_pairs"):
-            for idx, pair in enumerate(validated["word_pairs"]):
-                word_pair = WordMatchPair(
-                    left_word=pair["left"],
-                    right_word=pair["right"],
-                    left_image_url=pair.get("left_image_url"),
-                    right_image_url=pair.get("right_image_url"),
-                    position=idx
-                )
-                q.answer_components.append(word_pair)
+        # Word pairs become answer components
+        component_cls = WordMatchPair
+        component_rows = [
+            {
+                "left_word": pair["left"],
+                "right_word": pair["right"],
+                "left_image_url": pair.get("left_image_url"),
+                "right_image_url": pair.get("right_image_url"),
+                "position": idx
+            }
+            for idx, pair in enumerate(validated.get("word_pairs") or [])
+        ]
     
     else:
-        return jsonify({"msg": "unsupported question type"}), 400
+        return None
+    
+    return q, component_cls, component_rows
+
+
+@bp.post("/<int:quiz_id>/questions")
+@jwt_required()
+def add_question(quiz_id):
+    user_id = _uid(get_jwt_identity())
+    quiz = _owned_quiz(quiz_id, user_id)
+    if quiz is None:
+        return _not_owned(quiz_id)
+
+    data = request.get_json() or {}
+    validated = _QUESTION_INPUT.load(data)
+    
+    built = _build_question(quiz.id, validated)
+    if built is None:
+        return ojson({"msg": "unsupported question type"}, 400)
+    q, component_cls, component_rows = built
     
     db.session.add(q)
+    if component_rows:
+        # One executemany INSERT for all components rather than one ORM insert
+        # each; their ids aren't needed here, so nothing is fetched back
+        db.session.flush()
+        db.session.execute(insert(component_cls), [dict(row, question_id=q.id) for row in component_rows])
+    quiz.updated_at = datetime.utcnow()  # invalidates the cached quiz payload
+    db.session.commit()
+    invalidate_quiz_questions(quiz.id)
+    return ojson({"id": q.id}, 201)
+
+
+@bp.post("/<int:quiz_id>/questions/bulk")
+@jwt_required()
+def add_questions_bulk(quiz_id):
+    """Add several questions in one request: {"questions": [<question>, ...]}."""
+    user_id = _uid(get_jwt_identity())
+    quiz = _owned_quiz(quiz_id, user_id)
+    if quiz is None:
+        return _not_owned(quiz_id)
+
+    data = request.get_json() or {}
+    validated = _QUESTION_INPUT.load(data.get("questions") or [], many=True)
+    if not validated:
+        return ojson({"msg": "no questions given"}, 400)
+
+    built = [_build_question(quiz.id, item) for item in validated]
+    if None in built:
+        return ojson({"msg": "unsupported question type"}, 400)
+
+    # One flush inserts every question (batched per type) and assigns ids;
+    # then each component table gets a single executemany INSERT
+    questions = [q for q, _, _ in built]
+    db.session.add_all(questions)
+    db.session.flush()
+    rows_by_cls = {}
+    for q, component_cls, component_rows in built:
+        rows_by_cls.setdefault(component_cls, []).extend(dict(row, question_id=q.id) for row in component_rows)
+    for component_cls, rows in rows_by_cls.items():
+        if rows:
+            db.session.execute(insert(component_cls), rows)
+    quiz.updated_at = datetime.utcnow()  # invalidates the cached quiz payload
     db.session.commit()
-    return jsonify({"id": q.id}), 201
+    invalidate_quiz_questions(quiz_id)
+    return ojson({"ids": [q.id for q in questions]}, 201)
 
 
 @bp.put("/<int:quiz_id>")
 @jwt_required()
 def update_quiz(quiz_id):
-    quiz = Quiz.query.get_or_404(quiz_id)
-    user_id = get_jwt_identity()
-    try:
-        user_id = int(user_id)
-    except Exception:
-        return jsonify({"msg": "invalid identity"}), 401
-
-    if quiz.creator_id != user_id:
-        return jsonify({"msg": "forbidden"}), 403
+    user_id = _uid(get_jwt_identity())
+    if user_id is None:
+        return ojson({"msg": "invalid identity"}, 401)
 
     data = request.get_json() or {}
     # apply only allowed fields
-    for key in ("title", "description", "language", "is_public"):
-        if key in data:
-            setattr(quiz, key, data.get(key))
+    fields = {key: data.get(key) for key in ("title", "description", "language", "is_public") if key in data}
+    owned = (Quiz.id == quiz_id) & (Quiz.creator_id == user_id)
+    if fields:
+        # one UPDATE ... WHERE creator_id, no SELECT first; updated_at still bumps via onupdate
+        row = db.session.execute(
+            update(Quiz).where(owned).values(**fields).returning(Quiz.id, Quiz.title)
+        ).first()
+    else:
+        row = db.session.query(Quiz.id, Quiz.title).filter(owned).first()
+    if row is None:
+        db.session.rollback()
+        return _not_owned(quiz_id)
 
     db.session.commit()
-    return jsonify({"id": quiz.id, "title": quiz.title}), 200
+    return ojson({"id": row.id, "title": row.title}, 200)
+
+
+def _delete_question_children(question_ids):
+    """DELETE the components, answers and SRS items of the given questions (ids or a SELECT of ids)."""
+    for model in (AnswerComponentBase, UserAnswer, UserItem):
+        db.session.execute(
+            delete(model).where(model.question_id.in_(question_ids)).execution_options(synchronize_session=False)
+        )
 
 
 @bp.delete("/<int:quiz_id>")
 @jwt_required()
 def delete_quiz(quiz_id):
-    quiz = Quiz.query.get_or_404(quiz_id)
-    user_id = get_jwt_identity()
-    try:
-        user_id = int(user_id)
-    except Exception:
-        return jsonify({"msg": "invalid identity"}), 401
-
-    if quiz.creator_id != user_id:
-        return jsonify({"msg": "forbidden"}), 403
-
-    db.session.delete(quiz)
+    user_id = _uid(get_jwt_identity())
+    if user_id is None:
+        return ojson({"msg": "invalid identity"}, 401)
+
+    owned = db.session.query(Quiz.id).filter(Quiz.id == quiz_id, Quiz.creator_id == user_id).first()
+    if owned is None:
+        return _not_owned(quiz_id)
+
+    # Children are deleted explicitly rather than left to ON DELETE CASCADE:
+    # databases created before those FKs existed would reject the quiz DELETE
+    question_ids = select(QuestionBase.id).where(QuestionBase.quiz_id == quiz_id)
+    attempt_ids = select(QuizAttempt.id).where(QuizAttempt.quiz_id == quiz_id)
+    db.session.execute(delete(UserAnswer).where(UserAnswer.attempt_id.in_(attempt_ids)))
+    _delete_question_children(question_ids)
+    db.session.execute(delete(QuizAttempt).where(QuizAttempt.quiz_id == quiz_id))
+    db.session.execute(delete(SavedQuiz).where(SavedQuiz.quiz_id == quiz_id))
+    db.session.execute(delete(QuestionBase).where(QuestionBase.quiz_id == quiz_id))
+    db.session.execute(delete(Quiz).where(Quiz.id == quiz_id))
     db.session.commit()
-    return jsonify({"msg": "deleted"}), 200
+    invalidate_quiz_questions(quiz_id)
+    return ojson({"msg": "deleted"}, 200)
 
 
 @bp.delete("/<int:quiz_id>/questions/<int:question_id>")
 @jwt_required()
 def delete_question(quiz_id, question_id):
-    quiz = Quiz.query.get_or_404(quiz_id)
-    user_id = get_jwt_identity()
-    try:
-        user_id = int(user_id)
-    except Exception:
-        return jsonify({"msg": "invalid identity"}), 401
-
-    if quiz.creator_id != user_id:
-        return jsonify({"msg": "forbidden"}), 403
-
-    question = QuestionBase.query.get_or_404(question_id)
-    if question.quiz_id != quiz_id:
-        return jsonify({"msg": "question not in this quiz"}), 400
-
-    db.session.delete(question)
+    user_id = _uid(get_jwt_identity())
+    if user_id is None:
+        return ojson({"msg": "invalid identity"}, 401)
+
+    quiz = _owned_quiz(quiz_id, user_id)
+    if quiz is None:
+        return _not_owned(quiz_id)
+
+    question_quiz_id = db.session.scalar(select(QuestionBase.quiz_id).where(QuestionBase.id == question_id))
+    if question_quiz_id is None:
+        abort(404)
+    if question_quiz_id != quiz_id:
+        return ojson({"msg": "question not in this quiz"}, 400)
+
+    _delete_question_children([question_id])
+    db.session.execute(delete(QuestionBase).where(QuestionBase.id == question_id))
+    quiz.updated_at = datetime.utcnow()  # invalidates the cached quiz payload
     db.session.commit()
-    return jsonify({"msg": "deleted"}), 200
+    invalidate_quiz_questions(quiz.id)
+    return ojson({"msg": "deleted"}, 200)
 
 
 @bp.get("/public")
 @jwt_required(optional=True)
 def list_public_quizzes():
     """List all public drills with creator username and saved status"""
-    current_user = get_jwt_identity()
-    if current_user is not None:
-        try:
-            current_user = int(current_user)
-        except Exception:
-            current_user = None
+    current_user = _uid(get_jwt_identity())
     
-    quizzes = Quiz.query.filter_by(is_public=True).all()
-    result = []
+    quizzes = (db.session.query(*_LIST_COLUMNS, User.username)
+               .outerjoin(User, User.id == Quiz.creator_id)
+               .filter(Quiz.is_public == True))
+    language_names = _language_names(quizzes)
     
-    for q in quizzes:
-        quiz_data = QuizOut().dump(q)
-        quiz_data['creator_username'] = q.creator.username if q.creator else 'Unknown'
-        
-        # Add language name
-        if q.language:
-            lang = Language.query.get(q.language)
-            quiz_data['language_name'] = lang.name if lang else q.language
-        
-        # Check if user has saved this drill
-        if current_user:
-            saved = SavedQuiz.query.filter_by(user_id=current_user, quiz_id=q.id).first()
-            quiz_data['is_saved'] = saved is not None
-        else:
-            quiz_data['is_saved'] = False
-            
-        result.append(quiz_data)
+    # The user's saved drill ids, fetched once for the whole listing
+    saved_ids = set()
+    if current_user:
+        saved_ids = {
+            quiz_id for (quiz_id,) in
+            SavedQuiz.query.with_entities(SavedQuiz.quiz_id).filter(SavedQuiz.user_id == current_user)
+        }
     
-    return jsonify(result)
+    return ojson_stream(_quiz_rows(quizzes, language_names, with_creator=True, saved_ids=saved_ids))
 
 
 @bp.post("/<int:quiz_id>/save")
 @jwt_required()
 def save_quiz(quiz_id):
     """Save a drill to user's collection"""
-    user_id = get_jwt_identity()
-    if user_id is not None:
-        user_id = int(user_id)
+    user_id = _uid(get_jwt_identity())
     
     quiz = Quiz.query.get_or_404(quiz_id)
     
+    dialect = db.engine.dialect.name
+    if dialect in ("postgresql", "sqlite"):
+        # Single atomic statement; the unique (user_id, quiz_id) index decides
+        # whether it was already saved
+        insert_ = postgresql.insert if dialect == "postgresql" else sqlite.insert
+        result = db.session.execute(
+            insert_(SavedQuiz)
+            .values(user_id=user_id, quiz_id=quiz_id, saved_at=datetime.utcnow())
+            .on_conflict_do_nothing(index_elements=["user_id", "quiz_id"])
+        )
+        db.session.commit()
+        if result.rowcount == 0:
+            return ojson({"msg": "already saved"}, 200)
+        return ojson({"msg": "saved"}, 201)
+    
     # Check if already saved
     existing = SavedQuiz.query.filter_by(user_id=user_id, quiz_id=quiz_id).first()
     if existing:
-        return jsonify({"msg": "already saved"}), 200
+        return ojson({"msg": "already saved"}, 200)
     
     saved = SavedQuiz(user_id=user_id, quiz_id=quiz_id)
     db.session.add(saved)
     db.session.commit()
     
-    return jsonify({"msg": "saved"}), 201
+    return ojson({"msg": "saved"}, 201)
 
 
 @bp.delete("/<int:quiz_id>/save")
 @jwt_required()
 def unsave_quiz(quiz_id):
     """Remove a drill from user's collection"""
-    user_id = get_jwt_identity()
-    if user_id is not None:
-        user_id = int(user_id)
+    user_id = _uid(get_jwt_identity())
     
     saved = SavedQuiz.query.filter_by(user_id=user_id, quiz_id=quiz_id).first()
     if not saved:
-        return jsonify({"msg": "not found"}), 404
+        return ojson({"msg": "not found"}, 404)
     
     db.session.delete(saved)
     db.session.commit()
     
-    return jsonify({"msg": "removed"}), 200
+    return ojson({"msg": "removed"}, 200)
 
 
 @bp.delete("/<int:quiz_id>/clear-results")
 @jwt_required()
 def clear_quiz_results(quiz_id):
     """Delete all of user's attempts and related data for this quiz"""
-    user_id = get_jwt_identity()
-    if user_id is not None:
-        user_id = int(user_id)
+    user_id = _uid(get_jwt_identity())
     
-    quiz = Quiz.query.get_or_404(quiz_id)
+    Quiz.query.get_or_404(quiz_id)
     
-    # Delete all attempts for this quiz by this user
-    attempts = QuizAttempt.query.filter_by(quiz_id=quiz_id, user_id=user_id).all()
-    for attempt in attempts:
-        db.session.delete(attempt)
+    # Bulk DELETEs run in the database; nothing is loaded into the session.
+    # Answers go first since the attempts they belong to are deleted next.
+    attempt_ids = db.session.query(QuizAttempt.id).filter_by(quiz_id=quiz_id, user_id=user_id)
+    UserAnswer.query.filter(UserAnswer.attempt_id.in_(attempt_ids)).delete(synchronize_session=False)
+    QuizAttempt.query.filter_by(quiz_id=quiz_id, user_id=user_id).delete(synchronize_session=False)
     
     # Delete all UserItems (SRS data) for questions in this quiz by this user
-    question_ids = [q.id for q in quiz.questions]
-    user_items = UserItem.query.filter(
+    question_ids = db.session.query(QuestionBase.id).filter_by(quiz_id=quiz_id)
+    UserItem.query.filter(
         UserItem.user_id == user_id,
         UserItem.question_id.in_(question_ids)
-    ).all()
-    for item in user_items:
-        db.session.delete(item)
+    ).delete(synchronize_session=False)
     
     db.session.commit()
     
-    return jsonify({"msg": "results cleared"}), 200
+    return ojson({"msg": "results cleared"}, 200)
 
 
 @bp.get("/saved")
 @jwt_required()
 def list_saved_quizzes():
     """List drills saved by the current user"""
-    user_id = get_jwt_identity()
-    if user_id is not None:
-        user_id = int(user_id)
-    
-    saved_items = SavedQuiz.query.filter_by(user_id=user_id).all()
-    quizzes = []
+    user_id = _uid(get_jwt_identity())
     
-    for s in saved_items:
-        if s.quiz:
-            quiz_data = QuizOut().dump(s.quiz)
-            
-            # Add language name
-            if s.quiz.language:
-                lang = Language.query.get(s.quiz.language)
-                quiz_data['language_name'] = lang.name if lang else s.quiz.language
-            
-            quizzes.append(quiz_data)
+    quizzes = (db.session.query(*_LIST_COLUMNS).join(SavedQuiz, SavedQuiz.quiz_id == Quiz.id)
+               .filter(SavedQuiz.user_id == user_id)
+               .order_by(Quiz.id))
+    language_names = _language_names(quizzes)
     
-    return jsonify(quizzes)
+    return ojson_stream(_quiz_rows(quizzes, language_names))
@@ -1,7 +1,9 @@
-from flask import Blueprint, jsonify
+from flask import Blueprint
 from flask_jwt_extended import jwt_required, get_jwt_identity
+from sqlalchemy import case, distinct, func
 from ..extensions import db
-from ..models import QuizAttempt, Quiz, UserItem
+from ..responses import ojson
+from ..models import QuizAttempt, Quiz, UserAnswer, UserItem
 
 bp = Blueprint("users", __name__)
 
@@ -13,25 +15,29 @@ def my_progress():
     if current_user is not None:
         current_user = int(current_user)
 
-    # calculate accuracy per drill across all attempts
-    attempts = QuizAttempt.query.filter_by(user_id=current_user).all()
-    per_quiz = {}
-    for a in attempts:
-        total = len(a.answers)
-        correct = sum(1 for ans in a.answers if ans.was_correct)
-        if a.quiz_id not in per_quiz:
-            per_quiz[a.quiz_id] = {"quiz_id": a.quiz_id, "attempts": 0, "total": 0, "correct": 0}
-        per_quiz[a.quiz_id]["attempts"] += 1
-        per_quiz[a.quiz_id]["total"] += total
-        per_quiz[a.quiz_id]["correct"] += correct
+    # calculate accuracy per drill across all attempts, aggregated in the database
+    rows = (
+        db.session.query(
+            QuizAttempt.quiz_id,
+            Quiz.title,
+            func.count(distinct(QuizAttempt.id)),
+            func.count(UserAnswer.id),
+            func.coalesce(func.sum(case((UserAnswer.was_correct, 1), else_=0)), 0),
+        )
+        .outerjoin(Quiz, Quiz.id == QuizAttempt.quiz_id)
+        .outerjoin(UserAnswer, UserAnswer.attempt_id == QuizAttempt.id)
+        .filter(QuizAttempt.user_id == current_user)
+        .group_by(QuizAttempt.quiz_id, Quiz.title)
+        .order_by(func.min(QuizAttempt.id))  # first-attempted drill first, as before
+        .all()
+    )
 
     out = []
-    for qid, info in per_quiz.items():
-        accuracy = (info["correct"] / info["total"]) if info["total"] else 0.0
-        quiz = Quiz.query.get(qid)
-        out.append({"quiz_id": qid, "quiz_title": quiz.title if quiz else None, "accuracy": accuracy, "attempts": info["attempts"]})
+    for qid, title, attempts, total, correct in rows:
+        accuracy = (correct / total) if total else 0.0
+        out.append({"quiz_id": qid, "quiz_title": title, "accuracy": accuracy, "attempts": attempts})
 
-    return jsonify(out)
+    return ojson(out)
 
 
 @bp.get("/me/srs")
@@ -46,10 +52,10 @@ def my_srs():
     for it in items:
         out.append({
             "question_id": it.question_id,
-            "next_review_date": it.next_review_date.isoformat() if it.next_review_date else None,
+            "next_review_date": it.next_review_date,
             "ease_factor": it.ease_factor,
             "interval_days": it.interval_days,
             "success_streak": it.success_streak,
         })
 
-    return jsonify(out)
+    return ojson(out)
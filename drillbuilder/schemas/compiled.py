@@ -0,0 +1,40 @@
+"""
+Precompiled dump functions for flat output schemas.
+
+marshmallow's Schema.dump walks the declared fields and dispatches through
+each field's serialize() on every call. For schemas made only of scalar
+fields that copy an attribute straight through, compile_dump() generates a
+function that builds the output dict in one expression instead, e.g. for
+QuizOut:
+
+    def dump_QuizOut(obj):
+        return {"id": obj.id, "title": obj.title, ...}
+
+Only dumping is compiled. Loading still goes through marshmallow, which
+handles unknown-key rejection, type coercion and @validates_schema hooks.
+"""
+
+from marshmallow import fields
+
+# Fields whose serialized value is the attribute itself for the values our models hold
+_PASSTHROUGH_FIELDS = (fields.Int, fields.Str, fields.Bool)
+
+
+def compile_dump(schema_cls):
+    """Return a function equivalent to schema_cls().dump(obj) for flat, scalar-only schemas."""
+    schema = schema_cls()
+    items = []
+    for name, field in schema.dump_fields.items():
+        if type(field) not in _PASSTHROUGH_FIELDS:
+            raise TypeError(f"{schema_cls.__name__}.{name}: {type(field).__name__} cannot be precompiled")
+        attribute = field.attribute or name
+        if not attribute.isidentifier():
+            raise TypeError(f"{schema_cls.__name__}.{name}: attribute {attribute!r} cannot be precompiled")
+        key = field.data_key or name
+        items.append(f"{key!r}: obj.{attribute}")
+
+    func_name = f"dump_{schema_cls.__name__}"
+    source = f"def {func_name}(obj):\n    return {{{', '.join(items)}}}\n"
+    namespace = {}
+    exec(compile(source, f"<compiled {schema_cls.__name__}>", "exec"), namespace)
+    return namespace[func_name]
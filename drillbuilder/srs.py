@@ -1,5 +1,10 @@
 from datetime import date, timedelta
 
+from sqlalchemy import Integer, case, cast, func, literal
+from sqlalchemy.dialects import postgresql, sqlite
+
+from .models import UserItem
+
 
 def calculate_new_interval(success_streak: int, ease_factor: float, previous_interval: int) -> int:
     """Simple SRS interval calculator.
@@ -12,19 +17,86 @@ def calculate_new_interval(success_streak: int, ease_factor: float, previous_int
         return 1
     if success_streak == 2:
         return 6
-    return max(1, int(round(previous_interval * ease_factor)))
+    # round() of a float already returns an int; a plain comparison beats max()
+    interval = round(previous_interval * ease_factor)
+    return interval if interval > 1 else 1
+
+
+def srs_step(ease_factor: float, interval_days: int, success_streak: int, was_correct: bool):
+    """Apply one result to plain SRS values; returns (ease_factor, interval_days, success_streak).
+
+    Works on scalars only, so replays over many results can call it in a
+    loop without touching ORM objects.
+    """
+    if was_correct:
+        success_streak += 1
+        return ease_factor, calculate_new_interval(success_streak, ease_factor, interval_days or 1), success_streak
+    # failure — reset streak, set short interval and reduce ease factor slightly
+    return max(1.3, ease_factor - 0.1), 1, 0
 
 
 def update_user_item_on_result(item, was_correct: bool):
+    item.ease_factor, item.interval_days, item.success_streak = srs_step(
+        item.ease_factor, item.interval_days, item.success_streak, was_correct
+    )
+    item.next_review_date = date.today() + timedelta(days=item.interval_days)
+    return item
+
+
+def _add_days(dialect_name, day, days):
+    """SQL expression for the date `days` (an integer expression) after `day`."""
+    if dialect_name == "postgresql":
+        return literal(day) + days
+    return func.date(literal(day), func.printf("+%d days", days), type_=UserItem.next_review_date.type)
+
+
+def upsert_user_item_result(dialect_name, user_id, question_id, was_correct):
+    """Build one INSERT ... ON CONFLICT DO UPDATE that records a result on a UserItem.
+
+    Same arithmetic as update_user_item_on_result, done by the database, so
+    the get-or-create and the SRS update cost a single round trip.  Returns
+    None for dialects without ON CONFLICT support; use the ORM path there.
+    """
+    if dialect_name == "postgresql":
+        insert = postgresql.insert
+    elif dialect_name == "sqlite":
+        insert = sqlite.insert
+    else:
+        return None
+
     today = date.today()
+    # a brand new item gets the defaults with this result applied
+    fresh_ease, fresh_interval, fresh_streak = srs_step(2.5, 0, 0, was_correct)
+
     if was_correct:
-        item.success_streak = item.success_streak + 1
-        item.interval_days = calculate_new_interval(item.success_streak, item.ease_factor, item.interval_days or 1)
-        item.next_review_date = today + timedelta(days=item.interval_days)
+        streak = UserItem.success_streak + 1
+        scaled = cast(func.round(func.coalesce(func.nullif(UserItem.interval_days, 0), 1) * UserItem.ease_factor), Integer)
+        interval = case(
+            (streak <= 1, 1),
+            (streak == 2, 6),
+            (scaled < 1, 1),
+            else_=scaled,
+        )
+        changes = {
+            "success_streak": streak,
+            "interval_days": interval,
+            "next_review_date": _add_days(dialect_name, today, interval),
+        }
     else:
-        # failure — reset streak, set short interval and reduce ease factor slightly
-        item.success_streak = 0
-        item.interval_days = 1
-        item.next_review_date = today + timedelta(days=1)
-        item.ease_factor = max(1.3, item.ease_factor - 0.1)
-    return item
+        lowered = UserItem.ease_factor - 0.1
+        changes = {
+            "success_streak": 0,
+            "interval_days": 1,
+            "next_review_date": today + timedelta(days=1),
+            "ease_factor": case((lowered < 1.3, 1.3), else_=lowered),
+        }
+
+    stmt = insert(UserItem).values(
+        user_id=user_id,
+        question_id=question_id,
+        ease_factor=fresh_ease,
+        interval_days=fresh_interval,
+        success_streak=fresh_streak,
+        next_review_date=today + timedelta(days=fresh_interval),
+    )
+    return stmt.on_conflict_do_update(index_elements=["user_id", "question_id"], set_=changes)
@@ -29,7 +29,7 @@ class TrueFalseQuestion(QuestionBase):
         """
         is_correct = user_response == self.correct_answer
         feedback = "Correct!" if is_correct else f"Incorrect. The answer is {self.correct_answer}."
-        return is_correct, feedback
+        return is_correct, feedback, None
     
     def to_dict(self):
         data = super().to_dict()
@@ -56,11 +56,11 @@ class ImageIdentificationQuestion(QuestionBase):
         correct_option = next((c for c in self.answer_components if c.is_correct), None)
         
         if not correct_option:
-            return False, "No correct answer defined"
+            return False, "No correct answer defined", None
         
         is_correct = int(user_response) == correct_option.id
         feedback = "Correct!" if is_correct else "That's not the right image."
-        return is_correct, feedback
+        return is_correct, feedback, None
     
     def to_dict(self):
         data = super().to_dict()
@@ -118,7 +118,7 @@ class ListeningQuestion(QuestionBase):
             is_correct = user == correct
             feedback = "Correct!" if is_correct else f"Not quite. The answer is: {self.correct_answer}"
         
-        return is_correct, feedback
+        return is_correct, feedback, None
     
     def to_dict(self):
         data = super().to_dict()
@@ -171,7 +171,7 @@ class SequenceOrderQuestion(QuestionBase):
         correct_order = [c.id for c in sorted(self.answer_components, key=lambda x: x.position)]
         
         if not isinstance(user_response, list):
-            return False, "Invalid response format"
+            return False, "Invalid response format", None
         
         is_correct = user_response == correct_order
         
@@ -180,7 +180,7 @@ class SequenceOrderQuestion(QuestionBase):
         else:
             feedback = "Not quite. Review the order carefully."
         
-        return is_correct, feedback
+        return is_correct, feedback, None
     
     def to_dict(self):
         data = super().to_dict()
@@ -231,7 +231,7 @@ class CategorizationQuestion(QuestionBase):
                 Example: {1: 0, 2: 1, 3: 0} means items 1 and 3 go in category 0
         """
         if not isinstance(user_response, dict):
-            return False, "Invalid response format"
+            return False, "Invalid response format", None
         
         correct_count = 0
         total_items = len(self.answer_components)
@@ -244,7 +244,7 @@ class CategorizationQuestion(QuestionBase):
         is_correct = correct_count == total_items
         feedback = f"You correctly categorized {correct_count}/{total_items} items."
         
-        return is_correct, feedback
+        return is_correct, feedback, None
     
     def to_dict(self):
         import json
@@ -350,5 +350,5 @@ db.session.commit()
 
 # Validating answers (works the same for all types):
 question = QuestionBase.query.get(question_id)  # Gets correct subclass automatically
-is_correct, feedback = question.validate_answer(user_response)
+is_correct, feedback, details = question.validate_answer(user_response)
 """
@@ -1,4 +1,6 @@
 """Small script to create database and seed basic data for local development."""
+from sqlalchemy import insert
+
 from drillbuilder import create_app
 from drillbuilder.extensions import db
 from drillbuilder.models import User, Quiz
@@ -11,11 +13,16 @@ def seed():
     with app.app_context():
         db.create_all()
         if not User.query.filter_by(username="admin").first():
-            u = User(username="admin", email="admin@example.com", password_hash="pbkdf2:...devhash")
-            db.session.add(u)
-            db.session.commit()
-            q = Quiz(creator_id=u.id, title="Demo Quiz", description="A starter demo quiz", language="en", is_public=True)
-            db.session.add(q)
+            # bulk ORM inserts skip building and tracking objects we never read back
+            admin_id = db.session.scalar(
+                insert(User)
+                .values(username="admin", email="admin@example.com", password_hash="pbkdf2:...devhash")
+                .returning(User.id)
+            )
+            db.session.execute(insert(Quiz), [
+                {"creator_id": admin_id, "title": "Demo Quiz", "description": "A starter demo quiz",
+                 "language": "en", "is_public": True},
+            ])
             db.session.commit()
 
 
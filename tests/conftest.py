@@ -0,0 +1,108 @@
+import pytest
+from flask_jwt_extended import create_access_token
+from sqlalchemy import event, insert
+from sqlalchemy.orm import scoped_session, sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from drillbuilder import get_or_create_testing_app
+from drillbuilder.extensions import db
+from drillbuilder.models import User
+from drillbuilder.routes.auth import hash_password
+
+TEST_PASSWORD = "pw"
+
+
+@pytest.fixture(scope="session")
+def app():
+    """One app and one schema for the whole run; each test's writes are rolled back."""
+    app = get_or_create_testing_app({
+        "TESTING": True,
+        "SQLALCHEMY_DATABASE_URI": "sqlite:///:memory:",
+        # every checkout must get the one connection that holds the in-memory schema
+        "SQLALCHEMY_ENGINE_OPTIONS": {"poolclass": StaticPool, "connect_args": {"check_same_thread": False}},
+        # argon2's minimum cost: hashing stays real but takes microseconds, not tens of ms
+        "ARGON2_TIME_COST": 1,
+        "ARGON2_MEMORY_COST": 8,
+    })
+    with app.app_context():
+        engine = db.engine
+
+        # pysqlite only emits BEGIN lazily before DML, so a SAVEPOINT could open (and
+        # its RELEASE commit) the real transaction; take over transaction control
+        # so the per-test outer transaction is a real one
+        @event.listens_for(engine, "connect")
+        def _no_driver_transactions(dbapi_connection, connection_record):
+            dbapi_connection.isolation_level = None
+
+        @event.listens_for(engine, "begin")
+        def _emit_begin(conn):
+            conn.exec_driver_sql("BEGIN")
+
+        db.create_all()
+    return app
+
+
+@pytest.fixture(autouse=True)
+def _app_context(app):
+    """
+    Run each test inside an app context and one outer transaction that is rolled back.
+
+    db.session is swapped for one bound to that connection in create_savepoint
+    mode, so the app's own commit()/rollback() calls only release or roll back
+    SAVEPOINTs and teardown needs no DDL or DELETEs. (Flask-SQLAlchemy's own
+    Session always binds to the engine, which would start a second transaction.)
+    """
+    with app.app_context():
+        connection = db.engine.connect()
+        transaction = connection.begin()
+        app_session = db.session
+        db.session = scoped_session(sessionmaker(
+            bind=connection,
+            join_transaction_mode="create_savepoint",
+            expire_on_commit=app_session.session_factory.kw["expire_on_commit"],
+        ))
+        yield
+        db.session.remove()
+        db.session = app_session
+        transaction.rollback()
+        connection.close()
+        # runtime caches on the app would point at rows that no longer exist
+        app.extensions.pop("anon_user_id", None)
+        app.extensions.pop("languages_cache", None)
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture(scope="session")
+def password_hash(app):
+    """Hash of TEST_PASSWORD, computed once per run and reused for every fixture user."""
+    with app.app_context():
+        return hash_password(TEST_PASSWORD)
+
+
+@pytest.fixture
+def token_factory(app, password_hash):
+    """
+    Return make(username) -> JWT for a user created on first request.
+
+    Users are inserted directly with the precomputed hash and tokens are minted
+    locally, so no test pays for /auth/register + /auth/login hashing. Tokens
+    are memoised per test; the rows themselves are rolled back after it.
+    """
+    tokens = {}
+
+    def make(username):
+        if username not in tokens:
+            user_id = db.session.scalar(
+                insert(User)
+                .values(username=username, email=f"{username}@example.com", password_hash=password_hash)
+                .returning(User.id)
+            )
+            db.session.commit()
+            tokens[username] = create_access_token(identity=str(user_id))
+        return tokens[username]
+
+    return make
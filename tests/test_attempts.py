@@ -1,64 +1,143 @@
-import os
-import sys
-import pytest
+from datetime import date, timedelta
 
-ROOT = os.path.dirname(os.path.dirname(__file__))
-sys.path.insert(0, ROOT)
-
-from drillbuilder import create_app
 from drillbuilder.extensions import db
+from drillbuilder.models import QuizAttempt, UserAnswer, UserItem
 
 
-@pytest.fixture
-def client():
-    app = create_app({"TESTING": True, "SQLALCHEMY_DATABASE_URI": "sqlite:///:memory:"})
-    with app.app_context():
-        db.create_all()
-        client = app.test_client()
-        yield client
-        db.session.remove()
-        db.drop_all()
-
-
-def register_and_login(client, name="learner"):
-    client.post('/auth/register', json={'username': name, 'email': f'{name}@example.com', 'password': 'pw'})
-    r = client.post('/auth/login', json={'username': name, 'password': 'pw'})
-    return r.get_json()['access_token']
-
-
-def test_attempt_flow_and_srs(client):
-    token = register_and_login(client, 'player')
+def test_attempt_flow_and_srs(client, token_factory):
+    token = token_factory('player')
     headers = {'Authorization': f'Bearer {token}'}
 
-    # create quiz and add a free response question
+    # create quiz and add a cloze and a multiple choice question in one request
     r = client.post('/quizzes/', json={'title': 'TakeQuiz', 'is_public': True}, headers=headers)
     qid = r.get_json()['id']
 
-    qdata = {'type': 'free_response', 'prompt_text': 'Translate: hola', 'correct_answer': 'hello'}
-    client.post(f'/quizzes/{qid}/questions', json=qdata, headers=headers)
+    questions = [
+        {'type': 'cloze', 'prompt_text': 'Translate: hola',
+         'cloze_data': {'full_text': 'hello', 'blanks': [{'word': 'hello', 'char_position': 0}]}},
+        {'type': 'multiple_choice', 'prompt_text': '2+2?', 'mcq_options': [{'text': '4', 'is_correct': True}, {'text': '5'}]},
+    ]
+    r1 = client.post(f'/quizzes/{qid}/questions/bulk', json={'questions': questions}, headers=headers)
+    assert r1.status_code == 201
+    cloze_id, mcq_id = r1.get_json()['ids']
+    wrong_option = next(o['id'] for o in client.get(f'/quizzes/{qid}').get_json()['questions'][1]['options']
+                        if not o['is_correct'])
 
     # start attempt
     r2 = client.post(f'/attempts/{qid}/start', headers=headers)
     assert r2.status_code == 201
     payload = r2.get_json()
     attempt_id = payload['attempt_id']
-    questions = payload['questions']
-    assert len(questions) == 1
+    assert [q['id'] for q in payload['questions']] == [cloze_id, mcq_id]
 
-    # submit correct answer
-    qid_record = questions[0]['id']
-    r3 = client.post(f'/attempts/{attempt_id}/submit-question', json={'question_id': qid_record, 'user_response': 'hello'}, headers=headers)
+    # submit a correct cloze answer and a wrong choice
+    r3 = client.post(f'/attempts/{attempt_id}/submit-question', json={'question_id': cloze_id, 'response': {'0': 'hello'}}, headers=headers)
     assert r3.status_code == 200
-    assert r3.get_json()['was_correct'] is True
+    assert r3.get_json()['correct'] is True
+    r3 = client.post(f'/attempts/{attempt_id}/submit-question', json={'question_id': mcq_id, 'response': [wrong_option]}, headers=headers)
+    assert r3.get_json()['correct'] is False
 
     # finish attempt
     r4 = client.post(f'/attempts/{attempt_id}/finish', headers=headers)
     assert r4.status_code == 200
     score = r4.get_json()['score']
-    assert score == 1.0
+    assert score == 0.5
 
-    # check SRS item exists
+    # check SRS items exist
     r5 = client.get('/users/me/srs', headers=headers)
-    items = r5.get_json()
-    assert len(items) == 1
-    assert items[0]['success_streak'] >= 1
+    items = {i['question_id']: i for i in r5.get_json()}
+    assert set(items) == {cloze_id, mcq_id}
+    assert items[cloze_id]['success_streak'] >= 1
+    assert items[mcq_id]['success_streak'] == 0
+
+
+def test_submit_bulk_records_answers_and_srs(client, token_factory):
+    token = token_factory('bulk_player')
+    headers = {'Authorization': f'Bearer {token}'}
+    qid = client.post('/quizzes/', json={'title': 'BulkQuiz', 'is_public': True}, headers=headers).get_json()['id']
+    mcq = {'type': 'multiple_choice', 'prompt_text': '2+2?', 'mcq_options': [{'text': '4', 'is_correct': True}, {'text': '5'}]}
+    client.post(f'/quizzes/{qid}/questions/bulk', json={'questions': [mcq, mcq]}, headers=headers)
+    q_new, q_seen = client.get(f'/quizzes/{qid}').get_json()['questions']
+    right = {q['id']: [o['id'] for o in q['options'] if o['is_correct']] for q in (q_new, q_seen)}
+    wrong = {q['id']: [o['id'] for o in q['options'] if not o['is_correct']] for q in (q_new, q_seen)}
+
+    attempt_id = client.post(f'/attempts/{qid}/start', headers=headers).get_json()['attempt_id']
+    # q_seen already has one successful review on record
+    user_id = db.session.get(QuizAttempt, attempt_id).user_id
+    db.session.add(UserItem(user_id=user_id, question_id=q_seen['id'], ease_factor=2.5, interval_days=1, success_streak=1))
+    db.session.commit()
+
+    answers = [
+        {'question_id': q_new['id'], 'response': wrong[q_new['id']]},
+        {'question_id': q_seen['id'], 'response': right[q_seen['id']]},
+    ]
+    r = client.post(f'/attempts/{attempt_id}/submit-bulk', json={'answers': answers}, headers=headers)
+    assert r.status_code == 200
+    assert [(res['question_id'], res['correct']) for res in r.get_json()['results']] == [
+        (q_new['id'], False), (q_seen['id'], True)]
+
+    rows = UserAnswer.query.filter_by(attempt_id=attempt_id).order_by(UserAnswer.id).all()
+    assert [(a.question_id, a.was_correct) for a in rows] == [(q_new['id'], False), (q_seen['id'], True)]
+
+    items = {i.question_id: i for i in UserItem.query.filter_by(user_id=user_id)}
+    new_item, seen_item = items[q_new['id']], items[q_seen['id']]
+    # a new item answered wrongly: streak reset, ease reduced, review tomorrow
+    assert (new_item.success_streak, new_item.interval_days, new_item.ease_factor) == (0, 1, 2.4)
+    assert new_item.next_review_date == date.today() + timedelta(days=1)
+    # an existing item on its second success moves to the 6-day interval
+    assert (seen_item.success_streak, seen_item.interval_days) == (2, 6)
+    assert seen_item.next_review_date == date.today() + timedelta(days=6)
+
+
+def test_submit_bulk_rejects_non_integer_question_ids(client, token_factory):
+    headers = {'Authorization': f'Bearer {token_factory("bulk_bad")}'}
+    qid = client.post('/quizzes/', json={'title': 'BadIds'}, headers=headers).get_json()['id']
+    attempt_id = client.post(f'/attempts/{qid}/start', headers=headers).get_json()['attempt_id']
+
+    for bad in ([1], {'id': 1}, '1', True, None):
+        r = client.post(f'/attempts/{attempt_id}/submit-bulk',
+                        json={'answers': [{'question_id': bad, 'response': []}]}, headers=headers)
+        assert r.status_code == 400, bad
+
+
+def test_submit_question_stores_integers_beyond_64_bits(client, token_factory):
+    headers = {'Authorization': f'Bearer {token_factory("bigint")}'}
+    qid = client.post('/quizzes/', json={'title': 'BigInt'}, headers=headers).get_json()['id']
+    mcq = {'type': 'multiple_choice', 'prompt_text': '2+2?', 'mcq_options': [{'text': '4', 'is_correct': True}]}
+    question_id = client.post(f'/quizzes/{qid}/questions', json=mcq, headers=headers).get_json()['id']
+    attempt_id = client.post(f'/attempts/{qid}/start', headers=headers).get_json()['attempt_id']
+
+    r = client.post(f'/attempts/{attempt_id}/submit-question',
+                    json={'question_id': question_id, 'response': [2**70]}, headers=headers)
+    assert r.status_code == 200
+    assert r.get_json()['correct'] is False
+    assert UserAnswer.query.filter_by(attempt_id=attempt_id).one().user_response == f'[{2**70}]'
+
+
+def test_submit_attempt_stores_integers_beyond_64_bits(client, token_factory):
+    headers = {'Authorization': f'Bearer {token_factory("bigint_attempt")}'}
+    qid = client.post('/quizzes/', json={'title': 'BigInt'}, headers=headers).get_json()['id']
+    mcq = {'type': 'multiple_choice', 'prompt_text': '2+2?', 'mcq_options': [{'text': '4', 'is_correct': True}]}
+    question_id = client.post(f'/quizzes/{qid}/questions', json=mcq, headers=headers).get_json()['id']
+
+    r = client.post(f'/attempts/quizzes/{qid}/attempts',
+                    json={'responses': {str(question_id): [2**70]}}, headers=headers)
+    assert r.status_code == 201
+    assert r.get_json()['correct_count'] == 0
+    attempt = db.session.get(QuizAttempt, r.get_json()['attempt_id'])
+    assert str(2**70) in bytes(attempt.responses).decode()
+
+
+def test_submit_attempt_grades_malformed_response_as_incorrect(client, token_factory):
+    headers = {'Authorization': f'Bearer {token_factory("malformed")}'}
+    qid = client.post('/quizzes/', json={'title': 'Malformed'}, headers=headers).get_json()['id']
+    cloze = {'type': 'cloze', 'prompt_text': 'Translate: hola',
+             'cloze_data': {'full_text': 'hello', 'blanks': [{'word': 'hello', 'char_position': 0}]}}
+    question_id = client.post(f'/quizzes/{qid}/questions', json=cloze, headers=headers).get_json()['id']
+
+    # a cloze response must be a dict of blanks; a bare string is graded, not a 500
+    r = client.post(f'/attempts/quizzes/{qid}/attempts',
+                    json={'responses': {str(question_id): 'hello'}}, headers=headers)
+    assert r.status_code == 201
+    assert r.get_json()['correct_count'] == 0
+    assert r.get_json()['results'][0]['is_correct'] is False
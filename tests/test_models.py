@@ -1,27 +1,8 @@
-import os
-import sys
 import pytest
+from sqlalchemy.exc import IntegrityError
 
-# add project root to sys.path so the package can be imported by pytest
-ROOT = os.path.dirname(os.path.dirname(__file__))
-sys.path.insert(0, ROOT)
-
-from drillbuilder import create_app
 from drillbuilder.extensions import db
-from drillbuilder.models import User, Quiz, Question
-
-
-@pytest.fixture
-def app():
-    app = create_app({
-        "TESTING": True,
-        "SQLALCHEMY_DATABASE_URI": "sqlite:///:memory:",
-    })
-    with app.app_context():
-        db.create_all()
-        yield app
-        db.session.remove()
-        db.drop_all()
+from drillbuilder.models import User, Quiz, QuestionBase, MultipleChoiceQuestion, MCQOption
 
 
 def test_user_quiz_creation(app):
@@ -37,8 +18,24 @@ def test_user_quiz_creation(app):
     assert q in u.quizzes
 
     # add a question
-    qq = Question(quiz_id=q.id, type="free_response", prompt_text="Translate hi", correct_answer="hi")
+    qq = MultipleChoiceQuestion(quiz_id=q.id, prompt_text="Translate hi",
+                                answer_components=[MCQOption(text="hola", is_correct=True)])
     db.session.add(qq)
     db.session.commit()
 
     assert qq in q.questions
+
+    # deleting the quiz takes its questions with it
+    db.session.delete(q)
+    db.session.commit()
+    assert db.session.get(QuestionBase, qq.id) is None
+
+
+def test_usernames_are_unique_ignoring_case(app):
+    db.session.add(User(username="Tester", email="a@example.com", password_hash="x"))
+    db.session.commit()
+
+    db.session.add(User(username="tester", email="b@example.com", password_hash="x"))
+    with pytest.raises(IntegrityError):
+        db.session.commit()
+    db.session.rollback()
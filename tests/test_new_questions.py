@@ -0,0 +1,85 @@
+from sqlalchemy import delete, insert, select
+
+from drillbuilder.extensions import db
+from drillbuilder.models import (User, Quiz, QuestionBase, AnswerComponentBase, MultipleChoiceQuestion,
+                                 ClozeQuestion, WordMatchQuestion, MCQOption, ClozeBlank, WordMatchPair)
+
+
+def make_quiz(password_hash):
+    """Create a quiz with one question of each type; return its id."""
+    user_id = db.session.scalars(insert(User).returning(User.id), [
+        {"username": "test", "email": "test@example.com", "password_hash": password_hash},
+    ]).one()
+    quiz_id = db.session.scalars(insert(Quiz).returning(Quiz.id), [
+        {"creator_id": user_id, "title": "Test Quiz", "is_public": True},
+    ]).one()
+
+    # INSERT ... RETURNING hands back each new id without a separate flush
+    q1 = db.session.scalars(insert(MultipleChoiceQuestion).returning(MultipleChoiceQuestion.id), [
+        {"quiz_id": quiz_id, "prompt_text": "What is 2+2?", "position": 0},
+    ]).one()
+    q2 = db.session.scalars(insert(ClozeQuestion).returning(ClozeQuestion.id), [
+        {"quiz_id": quiz_id, "prompt_text": "The cat sat on the mat", "full_text": "The cat sat on the mat", "position": 1},
+    ]).one()
+    q3 = db.session.scalars(insert(WordMatchQuestion).returning(WordMatchQuestion.id), [
+        {"quiz_id": quiz_id, "prompt_text": "Match the words", "position": 2},
+    ]).one()
+
+    # Answer components go in as one executemany per type
+    db.session.execute(insert(MCQOption), [
+        {"question_id": q1, "text": "3", "is_correct": False, "position": 0},
+        {"question_id": q1, "text": "4", "is_correct": True, "position": 1},
+    ])
+    db.session.execute(insert(ClozeBlank), [
+        {"question_id": q2, "correct_answer": "cat", "char_position": 4, "position": 0},
+        {"question_id": q2, "correct_answer": "mat", "char_position": 19, "position": 1},
+    ])
+    db.session.execute(insert(WordMatchPair), [
+        {"question_id": q3, "left_word": "hello", "right_word": "hola", "position": 0},
+        {"question_id": q3, "left_word": "goodbye", "right_word": "adiós", "position": 1},
+    ])
+    db.session.commit()
+    return quiz_id
+
+
+def test_new_question_types(password_hash):
+    quiz = db.session.get(Quiz, make_quiz(password_hash))
+    q1, q2, q3 = quiz.questions
+
+    assert [q.type for q in quiz.questions] == ["multiple_choice", "cloze", "word_match"]
+    assert [o.text for o in q1.answer_components] == ["3", "4"]
+    assert [b.correct_answer for b in q2.answer_components] == ["cat", "mat"]
+    assert [(p.left_word, p.right_word) for p in q3.answer_components] == [("hello", "hola"), ("goodbye", "adiós")]
+
+
+def test_quiz_delete_cascades_in_database(password_hash):
+    quiz_id = make_quiz(password_hash)
+
+    # a Core DELETE never loads children, so this only passes if the FKs cascade
+    db.session.execute(delete(Quiz).where(Quiz.id == quiz_id))
+    db.session.commit()
+
+    # options, blanks and pairs all live in answer_components, so two EXISTS
+    # probes in one round trip cover every table the quiz cascades into
+    left = db.session.execute(select(
+        select(QuestionBase.id).exists().label("questions"),
+        select(AnswerComponentBase.id).exists().label("components"),
+    )).one()
+    assert not left.questions, "Questions should cascade delete"
+    assert not left.components, "Answer components (options, blanks, pairs) should cascade delete"
+
+
+def test_cloze_normalization_keeps_combining_marks():
+    # vowel and tone signs are combining marks (Mn/Mc); trimming them as
+    # punctuation would accept the bare consonant as the full answer
+    thai = ClozeBlank(correct_answer="ที่")
+    assert thai.validate_answer("ที่") == "correct"
+    assert thai.validate_answer("ท") != "correct"
+    assert thai.validate_answer("ทิ") != "correct"
+
+    devanagari = ClozeBlank(correct_answer="नमस्ते")
+    assert devanagari.validate_answer("नमस्ते।") == "correct"
+    assert devanagari.validate_answer("नमस्त") != "correct"
+    assert devanagari.validate_answer("नमस्ता") != "correct"
+
+    assert ClozeBlank(correct_answer="qué").validate_answer("¿Qué?") == "correct"
@@ -1,33 +1,9 @@
-import os
-import sys
-import pytest
+from drillbuilder.models import (AnswerComponentBase, QuestionBase, QuizAttempt, SavedQuiz,
+                                 UserAnswer, UserItem)
 
-ROOT = os.path.dirname(os.path.dirname(__file__))
-sys.path.insert(0, ROOT)
 
-from drillbuilder import create_app
-from drillbuilder.extensions import db
-
-
-@pytest.fixture
-def client():
-    app = create_app({"TESTING": True, "SQLALCHEMY_DATABASE_URI": "sqlite:///:memory:"})
-    with app.app_context():
-        db.create_all()
-        client = app.test_client()
-        yield client
-        db.session.remove()
-        db.drop_all()
-
-
-def register_and_login(client, username="bob"):
-    client.post('/auth/register', json={'username': username, 'email': f'{username}@example.com', 'password': 'pw'})
-    r = client.post('/auth/login', json={'username': username, 'password': 'pw'})
-    return r.get_json()['access_token']
-
-
-def test_create_list_and_get_quiz(client):
-    token = register_and_login(client, 'creator')
+def test_create_list_and_get_quiz(client, token_factory):
+    token = token_factory('creator')
 
     headers = {'Authorization': f'Bearer {token}'}
     r = client.post('/quizzes/', json={'title': 'My Quiz', 'is_public': True}, headers=headers)
@@ -48,28 +24,33 @@ def test_create_list_and_get_quiz(client):
     assert data['title'] == 'My Quiz'
 
 
-def test_add_question_and_forbidden(client):
-    creator_token = register_and_login(client, 'owner')
-    other_token = register_and_login(client, 'other')
+def test_add_question_and_forbidden(client, token_factory):
+    creator_token = token_factory('owner')
+    other_token = token_factory('other')
 
     headers = {'Authorization': f'Bearer {creator_token}'}
     r = client.post('/quizzes/', json={'title': 'Owner Quiz', 'is_public': False}, headers=headers)
     qid = r.get_json()['id']
 
-    # owner can add a question
-    qdata = {'type': 'free_response', 'prompt_text': 'Translate: hola', 'correct_answer': 'hello'}
-    r2 = client.post(f'/quizzes/{qid}/questions', json=qdata, headers=headers)
+    # owner can add questions
+    qdata = {'questions': [
+        {'type': 'cloze', 'prompt_text': 'Translate: hola',
+         'cloze_data': {'full_text': 'hello', 'blanks': [{'word': 'hello', 'char_position': 0}]}},
+        {'type': 'word_match', 'prompt_text': 'Match', 'word_pairs': [{'left': 'hola', 'right': 'hello'}]},
+    ]}
+    r2 = client.post(f'/quizzes/{qid}/questions/bulk', json=qdata, headers=headers)
     assert r2.status_code == 201
+    assert len(r2.get_json()['ids']) == 2
 
     # other user should be forbidden
     headers_other = {'Authorization': f'Bearer {other_token}'}
-    r3 = client.post(f'/quizzes/{qid}/questions', json=qdata, headers=headers_other)
+    r3 = client.post(f'/quizzes/{qid}/questions/bulk', json=qdata, headers=headers_other)
     assert r3.status_code == 403
 
 
-def test_update_and_delete_quiz(client):
-    creator_token = register_and_login(client, 'owner2')
-    other_token = register_and_login(client, 'other2')
+def test_update_and_delete_quiz(client, token_factory):
+    creator_token = token_factory('owner2')
+    other_token = token_factory('other2')
 
     headers = {'Authorization': f'Bearer {creator_token}'}
     r = client.post('/quizzes/', json={'title': 'Editable Quiz', 'is_public': False}, headers=headers)
@@ -92,3 +73,45 @@ def test_update_and_delete_quiz(client):
     # owner deletes successfully
     r5 = client.delete(f'/quizzes/{qid}', headers=headers)
     assert r5.status_code == 200
+
+
+def test_add_questions_bulk(client, token_factory):
+    headers = {'Authorization': f'Bearer {token_factory("bulk_owner")}'}
+    r = client.post('/quizzes/', json={'title': 'Bulk Quiz', 'is_public': True}, headers=headers)
+    qid = r.get_json()['id']
+
+    questions = [
+        {'type': 'multiple_choice', 'prompt_text': '2+2?', 'mcq_options': [{'text': '4', 'is_correct': True}, {'text': '5'}]},
+        {'type': 'word_match', 'prompt_text': 'Match', 'word_pairs': [{'left': 'hola', 'right': 'hello'}]},
+        {'type': 'multiple_choice', 'prompt_text': '3+3?', 'mcq_options': [{'text': '6', 'is_correct': True}]},
+    ]
+    r2 = client.post(f'/quizzes/{qid}/questions/bulk', json={'questions': questions}, headers=headers)
+    assert r2.status_code == 201
+    assert len(r2.get_json()['ids']) == 3
+
+    data = client.get(f'/quizzes/{qid}').get_json()
+    assert [q['prompt_text'] for q in data['questions']] == ['2+2?', 'Match', '3+3?']
+    assert [o['text'] for o in data['questions'][0]['options']] == ['4', '5']
+
+    # unsupported types reject the whole batch
+    r3 = client.post(f'/quizzes/{qid}/questions/bulk', json={'questions': [{'type': 'essay', 'prompt_text': 'x'}]}, headers=headers)
+    assert r3.status_code == 400
+
+
+def test_delete_quiz_removes_attempts_and_srs_items(client, token_factory):
+    headers = {'Authorization': f'Bearer {token_factory("deleter")}'}
+    qid = client.post('/quizzes/', json={'title': 'Doomed', 'is_public': True}, headers=headers).get_json()['id']
+    mcq = {'type': 'multiple_choice', 'prompt_text': '2+2?', 'mcq_options': [{'text': '4', 'is_correct': True}]}
+    ids = client.post(f'/quizzes/{qid}/questions/bulk', json={'questions': [mcq, mcq]}, headers=headers).get_json()['ids']
+    attempt_id = client.post(f'/attempts/{qid}/start', headers=headers).get_json()['attempt_id']
+    for question_id in ids:
+        client.post(f'/attempts/{attempt_id}/submit-question', json={'question_id': question_id, 'response': 0}, headers=headers)
+    client.post(f'/quizzes/{qid}/save', headers=headers)
+
+    assert client.delete(f'/quizzes/{qid}/questions/{ids[0]}', headers=headers).status_code == 200
+    assert UserItem.query.filter_by(question_id=ids[0]).count() == 0
+    assert UserAnswer.query.filter_by(question_id=ids[0]).count() == 0
+
+    assert client.delete(f'/quizzes/{qid}', headers=headers).status_code == 200
+    for model in (QuestionBase, AnswerComponentBase, QuizAttempt, UserAnswer, UserItem, SavedQuiz):
+        assert model.query.count() == 0, model.__name__